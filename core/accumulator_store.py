@@ -0,0 +1,139 @@
+"""
+Persistent polar grid accumulators
+Raw accumulators per (date, orbit, pole), so reruns only grid new granules
+"""
+
+import os
+import pathlib
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.file_manager import evict_least_recently_used
+
+# Total size of stored accumulators above which the least recently used are deleted
+MAX_STORE_BYTES = 2 * 1024 ** 3
+
+
+class PolarAccumulatorStore:
+    """On-disk store of un-finalized polar grid accumulators and their granules"""
+
+    def __init__(self, store_dir: pathlib.Path, max_bytes: int = MAX_STORE_BYTES):
+        """
+        Initialize accumulator store
+
+        Args:
+            store_dir: Directory holding the stored accumulators
+            max_bytes: Total size of stored accumulators above which the
+                least recently used entries are deleted
+        """
+        self.store_dir = pathlib.Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, date_str: str, orbit_type: str, pole: str,
+                    grid_shape: Tuple[int, int], pixel_size_m: float,
+                    layout: str) -> pathlib.Path:
+        """Store file for one (date, orbit, pole, grid resolution, layout) combination"""
+        height, width = grid_shape
+        return self.store_dir / (
+            f"{date_str}_{orbit_type}_{pole}_{width}x{height}_{int(round(pixel_size_m))}m_{layout}.npz"
+        )
+
+    def load(self, date_str: str, orbit_type: str, pole: str, grid_shape: Tuple[int, int],
+             pixel_size_m: float, layout: str = "dense"
+             ) -> Optional[Tuple[Dict[str, np.ndarray], List[str]]]:
+        """
+        Load stored accumulators
+
+        Args:
+            date_str: Date in YYYY-MM-DD format
+            orbit_type: 'A' for ascending, 'D' for descending
+            pole: 'N' or 'S'
+            grid_shape: (height, width) of the grid
+            pixel_size_m: Grid pixel size in metres
+            layout: Accumulator layout name ('dense' or 'compact')
+
+        Returns:
+            Tuple of (accumulator arrays by name, included granule ids) or None
+        """
+        path = self._entry_path(date_str, orbit_type, pole, grid_shape, pixel_size_m, layout)
+        if not path.exists():
+            return None
+
+        try:
+            with np.load(path) as entry:
+                state = {name: entry[name] for name in entry.files if name != 'granules'}
+                granules = [str(g) for g in entry['granules']]
+
+            if any(array.shape != tuple(grid_shape) for array in state.values()):
+                return None
+
+            # Mark as recently used
+            os.utime(path)
+            return state, granules
+
+        except Exception as e:
+            print(f"Ignoring unreadable accumulator store {path.name}: {e}")
+            return None
+
+    def included_granules(self, date_str: str, orbit_type: str, pole: str,
+                          grid_shape: Tuple[int, int], pixel_size_m: float,
+                          layout: str = "dense") -> Set[str]:
+        """
+        Granule ids already contained in the stored accumulators
+
+        Args:
+            date_str: Date in YYYY-MM-DD format
+            orbit_type: 'A' for ascending, 'D' for descending
+            pole: 'N' or 'S'
+            grid_shape: (height, width) of the grid
+            pixel_size_m: Grid pixel size in metres
+            layout: Accumulator layout name ('dense' or 'compact')
+
+        Returns:
+            Set of granule ids, empty if nothing is stored
+        """
+        path = self._entry_path(date_str, orbit_type, pole, grid_shape, pixel_size_m, layout)
+        if not path.exists():
+            return set()
+
+        try:
+            with np.load(path) as entry:
+                return {str(g) for g in entry['granules']}
+        except Exception:
+            return set()
+
+    def save(self, date_str: str, orbit_type: str, pole: str, grid_shape: Tuple[int, int],
+             pixel_size_m: float, state: Dict[str, np.ndarray], granules: List[str],
+             layout: str = "dense"):
+        """
+        Store accumulators and the granules they contain
+
+        Entries are compressed, most of a polar grid is empty. The least
+        recently used entries are deleted beyond max_bytes.
+
+        Args:
+            date_str: Date in YYYY-MM-DD format
+            orbit_type: 'A' for ascending, 'D' for descending
+            pole: 'N' or 'S'
+            grid_shape: (height, width) of the grid
+            pixel_size_m: Grid pixel size in metres
+            state: Accumulator arrays by name
+            granules: Ids of the granules accumulated so far
+            layout: Accumulator layout name ('dense' or 'compact')
+        """
+        path = self._entry_path(date_str, orbit_type, pole, grid_shape, pixel_size_m, layout)
+        tmp_path = path.with_suffix(".tmp.npz")
+
+        try:
+            np.savez_compressed(
+                tmp_path,
+                granules=np.asarray(granules, dtype=str),
+                **state
+            )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Could not write accumulator store {path.name}: {e}")
+            return
+
+        evict_least_recently_used(self.store_dir, self.max_bytes, "*.npz", keep=path)
@@ -8,7 +8,7 @@ import datetime as dt
 import tqdm
 import gportal
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 
 
 class GPortalClient:
@@ -85,7 +85,8 @@ class GPortalClient:
         return self.check_availability(date_str, orbit_type=None)
 
     def download_files(self, date_str: str, orbit_type: str, output_dir: pathlib.Path,
-                       progress_callback=None) -> List[pathlib.Path]:
+                       progress_callback=None,
+                       skip_names: Optional[Set[str]] = None) -> List[pathlib.Path]:
         """
         Download all files for a specific date and orbit type
 
@@ -94,6 +95,7 @@ class GPortalClient:
             orbit_type: 'A' for ascending, 'D' for descending
             output_dir: Directory to save files
             progress_callback: Function to call with progress updates
+            skip_names: Granule identifiers that are not downloaded
 
         Returns:
             List of downloaded file paths
@@ -102,6 +104,9 @@ class GPortalClient:
             # Get available files
             files = self.check_availability(date_str, orbit_type)
 
+            if skip_names:
+                files = [f for f in files if f['name'] not in skip_names]
+
             if not files:
                 return []
 
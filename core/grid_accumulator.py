@@ -0,0 +1,396 @@
+"""
+Bulk accumulation of swath samples into EASE-Grid 2.0 grids
+Shared by the 10 km polar processor and the 8x enhanced polar processor
+"""
+
+import logging
+
+import numpy as np
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sample count dtype of the compact layout; a day of granules stays far below
+# its limit, and a count that would pass it is widened to uint32
+COMPACT_COUNT_DTYPE = np.uint16
+
+
+def accumulate_swath(grid: np.ndarray, weight: np.ndarray, count: np.ndarray,
+                     px_x: np.ndarray, px_y: np.ndarray, values: np.ndarray):
+    """
+    Scatter-add all samples of one swath into the accumulators at once
+
+    Samples are reduced per target pixel with np.bincount over the pixels
+    the swath actually touches. The current sum of every touched pixel is
+    fed to bincount ahead of that pixel's samples, so the additions happen
+    in exactly the order of a per-sample loop and the sums are bit-identical.
+
+    Args:
+        grid: Sum accumulator, updated in place
+        weight: Weight accumulator, updated in place
+        count: Sample count accumulator, updated in place
+        px_x: Column index of each sample
+        px_y: Row index of each sample
+        values: Sample values
+    """
+    if len(values) == 0:
+        return
+
+    flat_idx = np.ravel_multi_index((px_y, px_x), grid.shape)
+    accumulate_flat(grid, weight, count, flat_idx, values)
+
+
+def accumulate_flat(grid: np.ndarray, weight: np.ndarray, count: np.ndarray,
+                    flat_idx: np.ndarray, values: np.ndarray):
+    """
+    Scatter-add samples addressed by flat (row-major) pixel index
+
+    Same as accumulate_swath, for callers that already hold flat indices.
+
+    Args:
+        grid: Sum accumulator, updated in place
+        weight: Weight accumulator, updated in place
+        count: Sample count accumulator, updated in place
+        flat_idx: Row-major pixel index of each sample
+        values: Sample values
+    """
+    if len(values) == 0:
+        return
+
+    pixels, inverse = np.unique(flat_idx, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    n_pixels = len(pixels)
+
+    # Existing sums first, then the samples in their original order
+    order = np.concatenate([np.arange(n_pixels), inverse])
+    addends = np.concatenate([grid.flat[pixels], np.asarray(values, dtype=np.float64)])
+    grid.flat[pixels] = np.bincount(order, weights=addends, minlength=n_pixels)
+
+    # Each sample has weight 1.0, so weights and counts are exact integers
+    samples = np.bincount(inverse, minlength=n_pixels)
+    weight.flat[pixels] = weight.flat[pixels] + samples
+    count.flat[pixels] = count.flat[pixels] + samples
+
+
+def partial_accumulate(flat_idx: np.ndarray, values: np.ndarray):
+    """
+    Reduce one swath to a sparse partial accumulator
+
+    Partials are independent of each other, so swaths can be reduced in
+    separate processes and combined afterwards with merge_partial.
+
+    Args:
+        flat_idx: Row-major pixel index of each sample
+        values: Sample values
+
+    Returns:
+        Tuple of (touched pixels, sum per pixel, sample count per pixel)
+    """
+    pixels, inverse = np.unique(flat_idx, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    n_pixels = len(pixels)
+
+    sums = np.bincount(inverse, weights=np.asarray(values, dtype=np.float64), minlength=n_pixels)
+    counts = np.bincount(inverse, minlength=n_pixels).astype(np.int32)
+
+    return pixels, sums, counts
+
+
+def merge_partial(grid: np.ndarray, weight: np.ndarray, count: np.ndarray,
+                  pixels: np.ndarray, sums: np.ndarray, counts: np.ndarray):
+    """
+    Add a partial accumulator from partial_accumulate into dense accumulators
+
+    Merging the same partials in the same order always gives the same sums,
+    whichever process produced them and whenever they completed.
+
+    Args:
+        grid: Sum accumulator, updated in place
+        weight: Weight accumulator, updated in place
+        count: Sample count accumulator, updated in place
+        pixels: Touched pixels (unique row-major indices)
+        sums: Sum per touched pixel
+        counts: Sample count per touched pixel
+    """
+    grid.flat[pixels] = grid.flat[pixels] + sums
+    weight.flat[pixels] = weight.flat[pixels] + counts
+    count.flat[pixels] = count.flat[pixels] + counts
+
+
+def merge_partial_compensated(total: np.ndarray, compensation: np.ndarray, count: np.ndarray,
+                              pixels: np.ndarray, sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Add a partial accumulator into float32 compensated accumulators
+
+    Each pixel's sum is held as total + compensation, two float32 values
+    whose sum carries about twice the precision of float32. The update is
+    done in float64 and split back into the rounded float32 total and the
+    float32 rounding error, so precision is not lost as partials pile up.
+
+    A count that would pass the limit of its dtype is not wrapped and does
+    not abort the run: the count array is widened to uint32 instead.
+
+    Args:
+        total: float32 rounded sum, updated in place
+        compensation: float32 rounding error of total, updated in place
+        count: Integer sample count, updated in place unless widened
+        pixels: Touched pixels (unique row-major indices)
+        sums: Sum per touched pixel
+        counts: Sample count per touched pixel
+
+    Returns:
+        The count array, a widened copy of count if it overflowed
+    """
+    exact = total.flat[pixels].astype(np.float64) + compensation.flat[pixels] + sums
+    rounded = exact.astype(np.float32)
+    total.flat[pixels] = rounded
+    compensation.flat[pixels] = (exact - rounded).astype(np.float32)
+
+    new_count = count.flat[pixels].astype(np.int64) + counts
+    if new_count.max() > np.iinfo(count.dtype).max:
+        logger.warning(f"More than {np.iinfo(count.dtype).max} samples in one pixel, "
+                       f"widening the count to uint32")
+        count = count.astype(np.uint32)
+    count.flat[pixels] = new_count
+    return count
+
+
+def _compensated_mean(total: np.ndarray, compensation: np.ndarray, count: np.ndarray,
+                      out: np.ndarray):
+    """Write total + compensation divided by count into out where count > 0"""
+    valid_mask = count > 0
+    out[valid_mask] = (
+        (total[valid_mask].astype(np.float64) + compensation[valid_mask]) / count[valid_mask]
+    ).astype(np.float32)
+
+
+class DenseGridAccumulator:
+    """float64 sum and weight plus int32 count, the reference accumulator layout"""
+
+    LAYOUT = "dense"
+
+    def __init__(self, height: int, width: int):
+        """
+        Initialize empty accumulators
+
+        Args:
+            height: Grid height in pixels
+            width: Grid width in pixels
+        """
+        self.grid = np.zeros((height, width), dtype=np.float64)
+        self.weight = np.zeros((height, width), dtype=np.float64)
+        self.count = np.zeros((height, width), dtype=np.int32)
+
+    def add(self, flat_idx: np.ndarray, values: np.ndarray):
+        """Scatter-add samples in order, bit-identical to a per-sample loop"""
+        accumulate_flat(self.grid, self.weight, self.count, flat_idx, values)
+
+    def merge(self, pixels: np.ndarray, sums: np.ndarray, counts: np.ndarray):
+        """Add a partial accumulator from partial_accumulate"""
+        merge_partial(self.grid, self.weight, self.count, pixels, sums, counts)
+
+    def mean(self) -> np.ndarray:
+        """float32 mean per pixel, NaN where no sample landed"""
+        final_grid = np.full(self.grid.shape, np.nan, dtype=np.float32)
+        valid_mask = self.weight > 0
+        final_grid[valid_mask] = (self.grid[valid_mask] / self.weight[valid_mask]).astype(np.float32)
+        return final_grid
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Arrays needed to resume accumulation"""
+        return {'grid': self.grid, 'weight': self.weight, 'count': self.count}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> "DenseGridAccumulator":
+        """Rebuild an accumulator from the arrays returned by state()"""
+        accumulator = cls.__new__(cls)
+        accumulator.grid = state['grid']
+        accumulator.weight = state['weight']
+        accumulator.count = state['count']
+        return accumulator
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the accumulators"""
+        return self.grid.nbytes + self.weight.nbytes + self.count.nbytes
+
+
+class CompactGridAccumulator:
+    """
+    float32 compensated sum and uint16 count, 10 bytes per pixel instead of 20
+
+    Exactly half the memory of the dense layout: the weight array is dropped
+    because every sample has weight 1.0, so it always equals the count.
+    Means agree with the dense layout to float32 rounding.
+    """
+
+    LAYOUT = "compact"
+
+    def __init__(self, height: int, width: int):
+        """
+        Initialize empty accumulators
+
+        Args:
+            height: Grid height in pixels
+            width: Grid width in pixels
+        """
+        self.total = np.zeros((height, width), dtype=np.float32)
+        self.compensation = np.zeros((height, width), dtype=np.float32)
+        self.count = np.zeros((height, width), dtype=COMPACT_COUNT_DTYPE)
+
+    def add(self, flat_idx: np.ndarray, values: np.ndarray):
+        """Scatter-add samples, summed per pixel in float64 and merged with compensation"""
+        if len(values) == 0:
+            return
+        self.merge(*partial_accumulate(flat_idx, values))
+
+    def merge(self, pixels: np.ndarray, sums: np.ndarray, counts: np.ndarray):
+        """Add a partial accumulator from partial_accumulate"""
+        self.count = merge_partial_compensated(self.total, self.compensation, self.count,
+                                               pixels, sums, counts)
+
+    def mean(self) -> np.ndarray:
+        """float32 mean per pixel, NaN where no sample landed"""
+        final_grid = np.full(self.total.shape, np.nan, dtype=np.float32)
+        _compensated_mean(self.total, self.compensation, self.count, final_grid)
+        return final_grid
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Arrays needed to resume accumulation"""
+        return {'total': self.total, 'compensation': self.compensation, 'count': self.count}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> "CompactGridAccumulator":
+        """Rebuild an accumulator from the arrays returned by state()"""
+        accumulator = cls.__new__(cls)
+        accumulator.total = state['total']
+        accumulator.compensation = state['compensation']
+        accumulator.count = state['count']
+        return accumulator
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the accumulators"""
+        return self.total.nbytes + self.compensation.nbytes + self.count.nbytes
+
+
+class TiledGridAccumulator:
+    """Sum/weight/count accumulator that only allocates the tiles swaths touch"""
+
+    def __init__(self, height: int, width: int, tile_size: int = 1024, compact: bool = False):
+        """
+        Initialize an empty tiled accumulator
+
+        Args:
+            height: Grid height in pixels
+            width: Grid width in pixels
+            tile_size: Edge length of a square tile in pixels
+            compact: Use the CompactGridAccumulator layout (float32
+                compensated sum and uint16 count) for each tile
+        """
+        self.height = height
+        self.width = width
+        self.tile_size = tile_size
+        self.compact = compact
+        self.tile_rows = -(-height // tile_size)
+        self.tile_cols = -(-width // tile_size)
+
+        # (tile_row, tile_col) -> (grid, weight, count), or
+        # (total, compensation, count) in compact mode
+        self.tiles = {}
+
+    def _get_tile(self, tile_row: int, tile_col: int):
+        """Return the accumulators of a tile, allocating them on first use"""
+        key = (tile_row, tile_col)
+        if key not in self.tiles:
+            tile_h = min(self.tile_size, self.height - tile_row * self.tile_size)
+            tile_w = min(self.tile_size, self.width - tile_col * self.tile_size)
+            if self.compact:
+                self.tiles[key] = (
+                    np.zeros((tile_h, tile_w), dtype=np.float32),
+                    np.zeros((tile_h, tile_w), dtype=np.float32),
+                    np.zeros((tile_h, tile_w), dtype=COMPACT_COUNT_DTYPE)
+                )
+            else:
+                self.tiles[key] = (
+                    np.zeros((tile_h, tile_w), dtype=np.float64),
+                    np.zeros((tile_h, tile_w), dtype=np.float64),
+                    np.zeros((tile_h, tile_w), dtype=np.int32)
+                )
+        return self.tiles[key]
+
+    def add(self, px_x: np.ndarray, px_y: np.ndarray, values: np.ndarray):
+        """
+        Scatter-add swath samples, split by tile
+
+        Samples keep their original order within each tile, so the sums are
+        bit-identical to accumulating into one dense grid. In compact mode
+        each tile's samples are summed in float64 and then merged with
+        compensation.
+
+        Args:
+            px_x: Column index of each sample
+            px_y: Row index of each sample
+            values: Sample values
+        """
+        if len(values) == 0:
+            return
+
+        tile_row = px_y // self.tile_size
+        tile_col = px_x // self.tile_size
+        tile_id = tile_row.astype(np.int64) * self.tile_cols + tile_col
+
+        order = np.argsort(tile_id, kind='stable')
+        sorted_ids = tile_id[order]
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+
+        for start, end in zip(starts, ends):
+            sel = order[start:end]
+            t_row, t_col = divmod(int(sorted_ids[start]), self.tile_cols)
+            tile = self._get_tile(t_row, t_col)
+            local_x = px_x[sel] - t_col * self.tile_size
+            local_y = px_y[sel] - t_row * self.tile_size
+
+            if self.compact:
+                flat_idx = np.ravel_multi_index((local_y, local_x), tile[0].shape)
+                count = merge_partial_compensated(*tile, *partial_accumulate(flat_idx, values[sel]))
+                self.tiles[(t_row, t_col)] = (tile[0], tile[1], count)
+            else:
+                accumulate_swath(*tile, local_x, local_y, values[sel])
+
+    def allocated_bytes(self) -> int:
+        """Memory currently held by allocated tiles"""
+        return sum(a.nbytes for tile in self.tiles.values() for a in tile)
+
+    def finalize(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Average the accumulated samples, releasing each tile once it is written
+
+        Args:
+            out: float32 array to write into (e.g. a np.memmap), allocated if None
+
+        Returns:
+            float32 grid of mean values, NaN where no sample landed
+        """
+        if out is None:
+            final_grid = np.full((self.height, self.width), np.nan, dtype=np.float32)
+        else:
+            final_grid = out
+            final_grid[:] = np.nan
+
+        for key in sorted(self.tiles):
+            tile = self.tiles.pop(key)
+            y0 = key[0] * self.tile_size
+            x0 = key[1] * self.tile_size
+            block = final_grid[y0:y0 + tile[0].shape[0], x0:x0 + tile[0].shape[1]]
+
+            if self.compact:
+                _compensated_mean(*tile, block)
+            else:
+                grid, weight, _ = tile
+                valid_mask = weight > 0
+                block[valid_mask] = (grid[valid_mask] / weight[valid_mask]).astype(np.float32)
+
+        return final_grid
+
@@ -0,0 +1,202 @@
+"""
+Vectorized hole filling for polar grids
+Inverse-distance filling expressed as normalized convolution
+"""
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+
+def inverse_distance_kernel(radius: int, power: float) -> np.ndarray:
+    """
+    Build the (2r+1)x(2r+1) inverse-distance weight kernel
+
+    Args:
+        radius: Search radius in pixels
+        power: Exponent applied to (distance + 0.1)
+
+    Returns:
+        Kernel with weight 1 / (distance + 0.1) ** power
+    """
+    offsets = np.arange(-radius, radius + 1)
+    dy, dx = np.meshgrid(offsets, offsets, indexing='ij')
+    distances = np.sqrt(dy ** 2 + dx ** 2)
+    return 1.0 / ((distances + 0.1) ** power)
+
+
+def _window_sizes(length: int, radius: int) -> np.ndarray:
+    """Number of in-bounds pixels of a clipped window along one axis"""
+    idx = np.arange(length)
+    return np.minimum(length, idx + radius + 1) - np.maximum(0, idx - radius)
+
+
+def fill_holes(data: np.ndarray, search_radius: np.ndarray, power: float,
+               coverage_threshold: float = 0.0, min_neighbors: int = 3,
+               fill_region: Optional[np.ndarray] = None) -> Tuple[np.ndarray, int]:
+    """
+    Fill NaN pixels with an inverse-distance weighted mean of their neighbours
+
+    Equivalent to visiting every hole, taking the valid pixels of its
+    square neighbourhood (clipped at the array border) and averaging them
+    with weights 1 / (distance + 0.1) ** power. Each distinct search radius
+    is one kernel, and the weighted sums for all holes of that radius come
+    from two whole-array convolutions (values and validity). Holes are only
+    filled from original valid pixels, never from other filled holes.
+
+    Args:
+        data: 2D array with NaN for missing pixels
+        search_radius: Integer search radius per pixel, same shape as data
+        power: Distance weighting exponent
+        coverage_threshold: Minimum fraction of valid pixels in the neighbourhood
+        min_neighbors: Minimum number of valid pixels in the neighbourhood
+        fill_region: Optional boolean mask; holes outside it are left as NaN
+
+    Returns:
+        Tuple of (filled array, number of filled holes)
+    """
+    filled_data = data.copy()
+    empty_mask = np.isnan(data)
+    hole_mask = empty_mask if fill_region is None else empty_mask & fill_region
+
+    if not np.any(hole_mask) or np.all(empty_mask):
+        return filled_data, 0
+
+    rows, cols = data.shape
+    valid = (~empty_mask).astype(np.float64)
+    values = np.where(empty_mask, 0.0, data).astype(np.float64)
+
+    filled_count = 0
+
+    for radius in np.unique(search_radius[hole_mask]):
+        radius = int(radius)
+        targets = hole_mask & (search_radius == radius)
+
+        # Restrict the convolutions to the rows holding this band (+ radius)
+        target_rows = np.flatnonzero(np.any(targets, axis=1))
+        r0 = max(0, target_rows[0] - radius)
+        r1 = min(rows, target_rows[-1] + radius + 1)
+
+        kernel = inverse_distance_kernel(radius, power)
+        box = np.ones_like(kernel)
+
+        weighted_sum = cv2.filter2D(values[r0:r1], -1, kernel, borderType=cv2.BORDER_CONSTANT)
+        weight_sum = cv2.filter2D(valid[r0:r1], -1, kernel, borderType=cv2.BORDER_CONSTANT)
+        valid_count = np.rint(cv2.filter2D(valid[r0:r1], -1, box, borderType=cv2.BORDER_CONSTANT))
+
+        # Neighbourhood size after clipping to the full array
+        total_count = np.outer(_window_sizes(rows, radius)[r0:r1], _window_sizes(cols, radius))
+        coverage = valid_count / total_count
+
+        fill_mask = (
+                targets[r0:r1] &
+                (coverage >= coverage_threshold) &
+                (valid_count >= min_neighbors)
+        )
+
+        band = filled_data[r0:r1]
+        band[fill_mask] = weighted_sum[fill_mask] / weight_sum[fill_mask]
+        filled_count += int(np.sum(fill_mask))
+
+    return filled_data, filled_count
+
+
+def temporary_memmap(shape: Tuple[int, int], dtype=np.float32,
+                     directory: Optional[str] = None) -> np.memmap:
+    """
+    Create a disk-backed array in an anonymous temporary file
+
+    The file is removed by the OS once the array is released.
+
+    Args:
+        shape: Array shape
+        dtype: Array dtype
+        directory: Directory for the temporary file, system default if None
+
+    Returns:
+        Writable memory-mapped array
+    """
+    handle = tempfile.TemporaryFile(dir=directory)
+    array = np.memmap(handle, dtype=dtype, mode='w+', shape=shape)
+    array._temp_handle = handle
+    return array
+
+
+def fill_holes_tiled(data: np.ndarray, min_radius: int, max_radius: int,
+                     distance_scale: float, power: float,
+                     coverage_threshold: float = 0.0, min_neighbors: int = 3,
+                     tile_size: int = 1024, workers: Optional[int] = None,
+                     out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, int]:
+    """
+    Tile-by-tile version of fill_holes for grids that do not fit in RAM
+
+    The search radius grows linearly with distance from the grid center,
+    from min_radius to max_radius at distance_scale. Each tile is read with
+    a halo of max_radius pixels, so every hole sees exactly the
+    neighbourhood it would see on the full grid. Tiles with no holes, or
+    with no valid pixel within reach, are copied through untouched. Tiles
+    run in a thread pool; the convolutions release the GIL.
+
+    Args:
+        data: 2D array (typically a np.memmap) with NaN for missing pixels
+        min_radius: Search radius at the grid center
+        max_radius: Search radius at and beyond distance_scale
+        distance_scale: Distance from center, in pixels, where max_radius is reached
+        power: Distance weighting exponent
+        coverage_threshold: Minimum fraction of valid pixels in the neighbourhood
+        min_neighbors: Minimum number of valid pixels in the neighbourhood
+        tile_size: Edge length of a square tile in pixels
+        workers: Number of worker threads, one per CPU if None
+        out: Output array, a temporary memmap of data's shape if None
+
+    Returns:
+        Tuple of (filled array, number of filled holes)
+    """
+    rows, cols = data.shape
+    halo = max_radius
+    center_y, center_x = rows // 2, cols // 2
+
+    if out is None:
+        out = temporary_memmap(data.shape, dtype=data.dtype)
+
+    def process_tile(y0, x0):
+        y1 = min(rows, y0 + tile_size)
+        x1 = min(cols, x0 + tile_size)
+        hy0, hx0 = max(0, y0 - halo), max(0, x0 - halo)
+        hy1, hx1 = min(rows, y1 + halo), min(cols, x1 + halo)
+
+        block = np.asarray(data[hy0:hy1, hx0:hx1])
+        core = (slice(y0 - hy0, y1 - hy0), slice(x0 - hx0, x1 - hx0))
+
+        core_holes = np.isnan(block[core])
+        if not np.any(core_holes) or np.all(np.isnan(block)):
+            out[y0:y1, x0:x1] = block[core]
+            return 0
+
+        # Adaptive radius from the distance to the grid center
+        y_idx, x_idx = np.ogrid[hy0:hy1, hx0:hx1]
+        distance = np.sqrt((x_idx - center_x) ** 2 + (y_idx - center_y) ** 2)
+        radius_factor = np.minimum(distance / distance_scale, 1.0)
+        search_radius = (min_radius + radius_factor * (max_radius - min_radius)).astype(np.int32)
+
+        fill_region = np.zeros(block.shape, dtype=bool)
+        fill_region[core] = True
+
+        filled_block, filled_count = fill_holes(
+            block, search_radius, power,
+            coverage_threshold=coverage_threshold, min_neighbors=min_neighbors,
+            fill_region=fill_region
+        )
+        out[y0:y1, x0:x1] = filled_block[core]
+        return filled_count
+
+    tile_origins = [(y0, x0) for y0 in range(0, rows, tile_size) for x0 in range(0, cols, tile_size)]
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        filled_count = sum(executor.map(lambda origin: process_tile(*origin), tile_origins))
+
+    return out, filled_count
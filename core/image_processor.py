@@ -3,20 +3,48 @@ Image processing functions for satellite data
 Based on user-provided polar image creation code
 """
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import h5py
 import numpy as np
-import pyproj
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 import pathlib
-from typing import List, Tuple, Optional
+from typing import List, Set, Tuple, Optional
 from PIL import Image
 
+from .accumulator_store import PolarAccumulatorStore
+from .grid_accumulator import CompactGridAccumulator, DenseGridAccumulator, partial_accumulate
+from .hole_filling import fill_holes
+from .projection import get_ease2_transformer, hemisphere_scan_range, latlon_to_ease2
+from .swath_index_cache import SwathIndexCache
+
 
 class ImageProcessor:
     """Processes satellite data into images"""
 
-    def __init__(self):
+    def __init__(self, index_cache_dir: Optional[pathlib.Path] = None,
+                 use_index_cache: bool = True, workers: Optional[int] = None,
+                 accumulator_dir: Optional[pathlib.Path] = None,
+                 use_accumulator_store: bool = True, compact_accumulators: bool = False):
+        """
+        Initialize image processor
+
+        Args:
+            index_cache_dir: Directory for the per-granule swath index cache,
+                the application cache directory if None
+            use_index_cache: Reuse cached swath-to-grid indices across runs
+            workers: Number of processes gridding granules, one per CPU if
+                None; 1 grids in the calling process
+            accumulator_dir: Directory for the per-day polar accumulators,
+                the application cache directory if None
+            use_accumulator_store: Keep per-day accumulators so reruns only
+                grid granules that were not included yet
+            compact_accumulators: Accumulate into float32 compensated sums and
+                a uint16 count instead of float64 sum/weight and int32 count
+        """
         # EASE-Grid 2.0 parameters (same for North and South)
         self.PIXEL_SIZE_M = 10000.0  # 10 km pixels
         self.GRID_WIDTH = 1800  # Official grid width
@@ -30,62 +58,114 @@ class ImageProcessor:
         self.GRID_ORIGIN_COL = -0.5
         self.GRID_ORIGIN_ROW = -0.5
 
-        # Set up projections for both poles
-        self.ease2_north = pyproj.CRS.from_epsg(6931)  # EASE-Grid 2.0 North
-        self.ease2_south = pyproj.CRS.from_epsg(6932)  # EASE-Grid 2.0 South
-        self.wgs84 = pyproj.CRS.from_epsg(4326)  # WGS84
+        # Projection method: 'analytic' NumPy fast path or 'pyproj'
+        self.projection_method = "analytic"
 
-        # Initialize transformers (will be set based on pole)
+        # Pole and shared transformer (will be set based on pole)
+        self.pole = "N"
         self.transformer = None
 
+        # Persistent swath-to-grid index cache
+        self.index_cache = None
+        if use_index_cache:
+            if index_cache_dir is None:
+                from utils.file_manager import FileManager
+                index_cache_dir = FileManager().get_cache_dir("swath_index")
+            self.index_cache = SwathIndexCache(index_cache_dir)
+
+        # Gridding processes (1 grids in the calling process)
+        self.workers = workers
+
+        # Accumulator layout
+        self.compact_accumulators = compact_accumulators
+
+        # Persistent per-day accumulators
+        self.accumulator_store = None
+        if use_accumulator_store:
+            if accumulator_dir is None:
+                from utils.file_manager import FileManager
+                accumulator_dir = FileManager().get_cache_dir("polar_accumulators")
+            self.accumulator_store = PolarAccumulatorStore(accumulator_dir)
+
     def create_polar_image(self, h5_files: List[pathlib.Path],
-                           orbit_type: str, pole: str = "N") -> Optional[np.ndarray]:
+                           orbit_type: str, pole: str = "N",
+                           date_str: Optional[str] = None) -> Optional[np.ndarray]:
         """
         Create circular polar image from satellite data files
 
+        With a date and the accumulator store enabled, granules already
+        accumulated for (date, orbit, pole) by an earlier run are skipped and
+        the new ones are added to the stored sums before finalizing.
+
         Args:
             h5_files: List of HDF5 file paths
             orbit_type: 'A' for ascending, 'D' for descending
             pole: 'N' for north, 'S' for south
+            date_str: Date in YYYY-MM-DD format, enables the accumulator store
 
         Returns:
             Temperature array or None
         """
-        # Set up transformer based on pole
-        if pole == "N":
-            self.transformer = pyproj.Transformer.from_crs(
-                self.wgs84, self.ease2_north, always_xy=True
-            )
-        else:  # pole == "S"
-            self.transformer = pyproj.Transformer.from_crs(
-                self.wgs84, self.ease2_south, always_xy=True
-            )
+        # Set up projection based on pole (transformers are cached process-wide)
+        self.pole = pole
+        self.transformer = get_ease2_transformer(pole)
 
         # Create grids
-        grid, weight, count, distance_from_pole = self._create_ease2_grid()
-
-        # Process each file
-        for idx, h5_path in enumerate(h5_files):
-            try:
-                self._add_swath_to_grid(
-                    h5_path, grid, weight, count, idx, orbit_type, pole
-                )
-            except Exception as e:
-                print(f"Error processing {h5_path.name}: {e}")
-                continue
+        accumulator = self._create_ease2_grid()
+
+        # Resume from the accumulators of an earlier run of the same day
+        grid_shape = (self.GRID_HEIGHT, self.GRID_WIDTH)
+        use_store = date_str is not None and self.accumulator_store is not None
+        included = []
+
+        if use_store:
+            stored = self.accumulator_store.load(
+                date_str, orbit_type, pole, grid_shape, self.PIXEL_SIZE_M, accumulator.LAYOUT
+            )
+            if stored is not None:
+                state, included = stored
+                accumulator = type(accumulator).from_state(state)
+                known = set(included)
+                h5_files = [h5_path for h5_path in h5_files if h5_path.stem not in known]
+                print(f"Reusing {len(included)} accumulated granules, {len(h5_files)} new")
+
+        workers = self.workers or os.cpu_count() or 1
+        workers = min(workers, len(h5_files))
+
+        if workers > 1:
+            added = self._grid_swaths_parallel(h5_files, accumulator, pole, workers)
+        else:
+            added = []
+            # Process each file
+            for idx, h5_path in enumerate(h5_files):
+                try:
+                    self._add_swath_to_grid(
+                        h5_path, accumulator, idx, orbit_type, pole
+                    )
+                    added.append(h5_path.stem)
+                except Exception as e:
+                    print(f"Error processing {h5_path.name}: {e}")
+                    continue
+
+        if use_store and added:
+            self.accumulator_store.save(
+                date_str, orbit_type, pole, grid_shape, self.PIXEL_SIZE_M,
+                accumulator.state(), included + added, accumulator.LAYOUT
+            )
 
         # Finalize grid
-        final_grid = self._finalize_grid(grid, weight, distance_from_pole)
+        final_grid = self._finalize_grid(accumulator)
 
         return final_grid
 
     def _create_ease2_grid(self):
-        """Create empty grids for data accumulation"""
-        grid = np.zeros((self.GRID_HEIGHT, self.GRID_WIDTH), dtype=np.float64)
-        weight = np.zeros((self.GRID_HEIGHT, self.GRID_WIDTH), dtype=np.float64)
-        count = np.zeros((self.GRID_HEIGHT, self.GRID_WIDTH), dtype=np.int32)
+        """Create empty accumulators for data accumulation"""
+        if self.compact_accumulators:
+            return CompactGridAccumulator(self.GRID_HEIGHT, self.GRID_WIDTH)
+        return DenseGridAccumulator(self.GRID_HEIGHT, self.GRID_WIDTH)
 
-        # Calculate distance from pole
+    def _distance_from_pole(self):
+        """Distance of every pixel from the pole in pixels, built when hole filling needs it"""
         center_x = self.GRID_WIDTH // 2
         center_y = self.GRID_HEIGHT // 2
         y_indices, x_indices = np.meshgrid(
@@ -95,20 +175,130 @@ class ImageProcessor:
             (x_indices - center_x) ** 2 + (y_indices - center_y) ** 2
         )
 
-        return grid, weight, count, distance_from_pole
+        return distance_from_pole
+
+    def _grid_swaths_parallel(self, h5_files: List[pathlib.Path], accumulator,
+                              pole: str, workers: int) -> List[str]:
+        """
+        Grid swath files in worker processes and merge their partial grids
+
+        Each worker reduces one granule to a sparse partial accumulator.
+        Partials are merged in file order, not completion order, so the
+        result is the same for any number of workers > 1. Per-granule sums
+        are added to the grid as a whole rather than sample by sample, so it
+        matches the serial path (_add_swath_to_grid) only to float64
+        rounding, not bit for bit.
+
+        Returns:
+            Ids of the granules that were processed
+        """
+        added = []
+        index_cache_dir = self.index_cache.cache_dir if self.index_cache is not None else None
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_gridding_worker,
+            initargs=(index_cache_dir, self.index_cache is not None, self.projection_method)
+        )
+
+        with executor:
+            futures = [executor.submit(_grid_swath_partial, h5_path, pole) for h5_path in h5_files]
+
+            for h5_path, future in zip(h5_files, futures):
+                try:
+                    partial = future.result()
+                except Exception as e:
+                    print(f"Error processing {h5_path.name}: {e}")
+                    continue
+
+                if partial is not None:
+                    accumulator.merge(*partial)
+                added.append(h5_path.stem)
+
+        return added
+
+    def included_granules(self, date_str: str, orbit_type: str, pole: str = "N") -> Set[str]:
+        """
+        Granules already accumulated for a day by earlier runs
+
+        Args:
+            date_str: Date in YYYY-MM-DD format
+            orbit_type: 'A' for ascending, 'D' for descending
+            pole: 'N' for north, 'S' for south
+
+        Returns:
+            Set of granule ids (HDF5 file stems), empty without a store
+        """
+        if self.accumulator_store is None:
+            return set()
+
+        return self.accumulator_store.included_granules(
+            date_str, orbit_type, pole, (self.GRID_HEIGHT, self.GRID_WIDTH), self.PIXEL_SIZE_M,
+            CompactGridAccumulator.LAYOUT if self.compact_accumulators else DenseGridAccumulator.LAYOUT
+        )
 
-    def _add_swath_to_grid(self, h5_path: pathlib.Path, grid: np.ndarray,
-                           weight: np.ndarray, count: np.ndarray,
+    def _add_swath_to_grid(self, h5_path: pathlib.Path, accumulator,
                            swath_idx: int, orbit_type: str, pole: str = "N"):
-        """Add data from one swath file to the grid"""
+        """
+        Add data from one swath file to the grid
+
+        Dense accumulators add the samples in order, so the sums are
+        bit-identical to a per-sample loop.
+        """
+        samples = self._swath_samples(h5_path, pole)
+
+        if samples is not None:
+            accumulator.add(*samples)
+
+    def _swath_partial(self, h5_path: pathlib.Path, pole: str = "N"):
+        """
+        Reduce one swath file to a sparse partial accumulator
+
+        Args:
+            h5_path: HDF5 file of the granule
+            pole: 'N' or 'S'
+
+        Returns:
+            Tuple of (touched pixels, sum per pixel, count per pixel) or None
+        """
+        samples = self._swath_samples(h5_path, pole)
+
+        if samples is None:
+            return None
+
+        return partial_accumulate(*samples)
+
+    def _swath_samples(self, h5_path: pathlib.Path, pole: str = "N"):
+        """
+        Valid samples of one swath file and the grid pixels they land on
+
+        Args:
+            h5_path: HDF5 file of the granule
+            pole: 'N' or 'S'
+
+        Returns:
+            Tuple of (row-major pixel index, temperature) per sample, in
+            projection order, or None
+        """
         with h5py.File(h5_path, "r") as h5:
             # Extract temperature data
             var_name = "Brightness Temperature (36.5GHz,H)"
             if var_name not in h5:
                 print(f"Variable {var_name} not found in {h5_path.name}")
-                return
+                return None
+
+            # Samples that land on the grid and their pixels (cached per granule)
+            geo_mask, pixel_index = self._get_swath_pixels(h5, h5_path.stem, pole)
+
+            if len(pixel_index) == 0:
+                return None
 
-            raw = h5[var_name][:].astype(np.float64)
+            # Only read and scale the scan lines that reach the grid
+            rows = np.flatnonzero(np.any(geo_mask, axis=1))
+            row_start, row_stop = rows[0], rows[-1] + 1
+
+            raw = h5[var_name][row_start:row_stop].astype(np.float64)
 
             # Get scale factor
             scale = 1.0
@@ -120,8 +310,48 @@ class ImageProcessor:
             # Apply scale factor and handle missing values
             tb = np.where(raw == 0, np.nan, raw * scale)
 
-            # Get coordinates
-            lat, lon = self._calculate_lat_lon_36ghz(h5)
+            # Gather valid temperatures, in the same order as the projection
+            tb_vals = tb[geo_mask[row_start:row_stop]]
+            has_data = ~np.isnan(tb_vals)
+
+            if not np.any(has_data):
+                return None
+
+            return pixel_index[has_data], tb_vals[has_data]
+
+    def _get_swath_pixels(self, h5, granule_id: str, pole: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Map swath samples to flat grid pixel indices
+
+        Args:
+            h5: Open HDF5 file of the granule
+            granule_id: Granule identifier used as cache key
+            pole: 'N' or 'S'
+
+        Returns:
+            Tuple of (mask of samples on the grid, flat pixel index per such sample)
+        """
+        grid_shape = (self.GRID_HEIGHT, self.GRID_WIDTH)
+
+        if self.index_cache is not None:
+            cached = self.index_cache.load(granule_id, pole, grid_shape, self.PIXEL_SIZE_M,
+                                           self.projection_method)
+            if cached is not None:
+                return cached
+
+        # Get coordinates
+        lat, lon = self._calculate_lat_lon_36ghz(h5)
+
+        geo_mask = np.zeros(lat.shape, dtype=bool)
+        pixel_index = np.zeros(0, dtype=np.int32)
+
+        # Drop scan lines that cannot reach this pole's grid before projecting
+        scan_range = hemisphere_scan_range(lat, pole)
+
+        if scan_range is not None:
+            row_start, row_stop = scan_range
+            lat = lat[row_start:row_stop]
+            lon = lon[row_start:row_stop]
 
             # Filter for correct hemisphere
             if pole == "N":
@@ -129,36 +359,23 @@ class ImageProcessor:
             else:  # pole == "S"
                 hemisphere_mask = lat <= 0
 
-            if not np.any(hemisphere_mask):
-                return
-
             # Transform to EASE-Grid 2.0
             x_ease2, y_ease2 = self._latlon_to_ease2(lat, lon)
 
             # Get grid bounds
             x_min, x_max, y_min, y_max = self._get_grid_bounds()
 
-            # Valid data mask
-            # Valid data mask
-            valid_mask = (
+            # Valid geometry mask
+            scan_mask = (
                     hemisphere_mask &
-                    ~np.isnan(tb) &
                     (x_ease2 >= x_min) & (x_ease2 <= x_max) &
                     (y_ease2 >= y_min) & (y_ease2 <= y_max) &
                     ~np.isnan(x_ease2) &
                     ~np.isnan(y_ease2)
             )
 
-            if not np.any(valid_mask):
-                return
-
-            # Extract valid values
-            x_vals = x_ease2[valid_mask]
-            y_vals = y_ease2[valid_mask]
-            tb_vals = tb[valid_mask]
-
             # Convert to pixel indices
-            px_x, px_y = self._meters_to_pixels(x_vals, y_vals)
+            px_x, px_y = self._meters_to_pixels(x_ease2[scan_mask], y_ease2[scan_mask])
 
             # Check bounds
             valid_pixels = (
@@ -166,25 +383,19 @@ class ImageProcessor:
                     (px_y >= 0) & (px_y < self.GRID_HEIGHT)
             )
 
-            px_x = px_x[valid_pixels]
-            px_y = px_y[valid_pixels]
-            tb_vals = tb_vals[valid_pixels]
+            scan_mask[scan_mask] = valid_pixels
+            geo_mask[row_start:row_stop] = scan_mask
+            pixel_index = (px_y[valid_pixels] * self.GRID_WIDTH + px_x[valid_pixels]).astype(np.int32)
 
-            # Accumulate data
-            for i in range(len(tb_vals)):
-                x_idx, y_idx = px_x[i], px_y[i]
-                value = tb_vals[i]
+        if self.index_cache is not None:
+            self.index_cache.save(granule_id, pole, grid_shape, self.PIXEL_SIZE_M,
+                                  self.projection_method, geo_mask, pixel_index)
 
-                grid[y_idx, x_idx] += value
-                weight[y_idx, x_idx] += 1.0
-                count[y_idx, x_idx] += 1
+        return geo_mask, pixel_index
 
     def _latlon_to_ease2(self, lat, lon):
-        """Transform coordinates to EASE-Grid 2.0 (North or South based on current transformer)"""
-        x, y = self.transformer.transform(lon, lat)
-        x = np.where(np.isinf(x), np.nan, x)
-        y = np.where(np.isinf(y), np.nan, y)
-        return x, y
+        """Transform coordinates to EASE-Grid 2.0 (North or South based on current pole)"""
+        return latlon_to_ease2(lat, lon, self.pole, method=self.projection_method)
 
     def _meters_to_pixels(self, x_m, y_m):
         """Convert EASE-Grid 2.0 coordinates to pixel indices"""
@@ -230,32 +441,31 @@ class ImageProcessor:
 
         return lat_36, lon_36
 
-    def _finalize_grid(self, grid, weight, distance_from_pole, apply_filling=True):
+    def _finalize_grid(self, accumulator, apply_filling=True):
         """Finalize grid and optionally fill holes"""
-        final_grid = np.full(grid.shape, np.nan, dtype=np.float32)
-        valid_mask = weight > 0
+        final_grid = accumulator.mean()
 
-        if not np.any(valid_mask):
+        if np.all(np.isnan(final_grid)):
             print("ERROR: No valid data for finalization!")
             return final_grid
 
-        final_grid[valid_mask] = (grid[valid_mask] / weight[valid_mask]).astype(np.float32)
-
         if apply_filling:
-            final_grid = self._smart_fill_holes(final_grid, distance_from_pole)
+            final_grid = self._smart_fill_holes(final_grid)
 
         return final_grid
 
-    def _smart_fill_holes(self, data, distance_from_pole):
-        """Fill holes in data using weighted interpolation"""
-        filled_data = data.copy()
-        rows, cols = data.shape
+    def _smart_fill_holes(self, data, distance_from_pole=None):
+        """
+        Fill holes in data using weighted interpolation
 
+        Vectorized with normalized convolution; matches the former per-pixel
+        filler to within 1e-4 K (float32 rounding of the weighted mean).
+        """
         empty_mask = np.isnan(data)
         initial_holes = np.sum(empty_mask)
 
         if initial_holes == 0:
-            return filled_data
+            return data.copy()
 
         # Parameters for adaptive radius
         MIN_RADIUS = 2
@@ -263,48 +473,17 @@ class ImageProcessor:
         DISTANCE_SCALE = 400
         COVERAGE_THRESHOLD = 0.3
 
-        filled_count = 0
-
-        for y in range(rows):
-            for x in range(cols):
-                if not empty_mask[y, x]:
-                    continue
-
-                dist_from_pole = distance_from_pole[y, x]
-
-                # Adaptive radius
-                radius_factor = min(dist_from_pole / DISTANCE_SCALE, 1.0)
-                search_radius = int(MIN_RADIUS + radius_factor * (MAX_RADIUS - MIN_RADIUS))
+        if distance_from_pole is None:
+            distance_from_pole = self._distance_from_pole()
 
-                # Define neighborhood
-                y_min = max(0, y - search_radius)
-                y_max = min(rows, y + search_radius + 1)
-                x_min = max(0, x - search_radius)
-                x_max = min(cols, x + search_radius + 1)
+        # Adaptive radius
+        radius_factor = np.minimum(distance_from_pole / DISTANCE_SCALE, 1.0)
+        search_radius = (MIN_RADIUS + radius_factor * (MAX_RADIUS - MIN_RADIUS)).astype(np.int32)
 
-                neighborhood = data[y_min:y_max, x_min:x_max]
-                valid_mask = ~np.isnan(neighborhood)
-                valid_count = np.sum(valid_mask)
-                total_count = neighborhood.size
-
-                coverage = valid_count / total_count if total_count > 0 else 0
-
-                if coverage >= COVERAGE_THRESHOLD and valid_count >= 3:
-                    # Get valid coordinates
-                    valid_y, valid_x = np.where(valid_mask)
-                    valid_y += y_min
-                    valid_x += x_min
-
-                    # Calculate weights based on distance
-                    distances = np.sqrt((valid_y - y) ** 2 + (valid_x - x) ** 2)
-                    weights = 1.0 / ((distances + 0.1) ** 4)
-                    weights /= weights.sum()
-
-                    # Weighted average
-                    valid_values = data[valid_y, valid_x]
-                    filled_value = np.sum(valid_values * weights)
-                    filled_data[y, x] = filled_value
-                    filled_count += 1
+        filled_data, filled_count = fill_holes(
+            data, search_radius, power=4,
+            coverage_threshold=COVERAGE_THRESHOLD, min_neighbors=3
+        )
 
         print(f"Filled {filled_count} holes out of {initial_holes}")
         return filled_data
@@ -512,4 +691,25 @@ class ImageProcessor:
             normalized[~valid_mask] = 0
             return normalized.astype(np.uint8)
         else:
-            return np.zeros_like(data, dtype=np.uint8)
\ No newline at end of file
+            return np.zeros_like(data, dtype=np.uint8)
+
+
+# Per-process processor of the parallel gridding pool
+_worker_processor = None
+
+
+def _init_gridding_worker(index_cache_dir: Optional[pathlib.Path],
+                          use_index_cache: bool, projection_method: str):
+    """Create the ImageProcessor a gridding worker process reuses for every granule"""
+    global _worker_processor
+    _worker_processor = ImageProcessor(
+        index_cache_dir=index_cache_dir, use_index_cache=use_index_cache, workers=1,
+        use_accumulator_store=False
+    )
+    _worker_processor.projection_method = projection_method
+
+
+def _grid_swath_partial(h5_path: pathlib.Path, pole: str):
+    """Gridding worker task: one granule to a partial accumulator"""
+    _worker_processor.pole = pole
+    return _worker_processor._swath_partial(h5_path, pole)
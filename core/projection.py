@@ -0,0 +1,144 @@
+"""
+EASE-Grid 2.0 polar projection helpers
+Process-wide transformer cache and a vectorized analytic forward transform
+"""
+
+import threading
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+import pyproj
+
+# EPSG codes of the EASE-Grid 2.0 polar projections
+EASE2_EPSG = {"N": 6931, "S": 6932}
+
+# WGS84 ellipsoid, the datum of both EASE-Grid 2.0 polar projections
+WGS84_A = 6378137.0
+WGS84_F = 1.0 / 298.257223563
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+WGS84_E = np.sqrt(WGS84_E2)
+
+_transformer_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _create_ease2_transformer(pole: str) -> pyproj.Transformer:
+    return pyproj.Transformer.from_crs(
+        pyproj.CRS.from_epsg(4326), pyproj.CRS.from_epsg(EASE2_EPSG[pole]), always_xy=True
+    )
+
+
+def get_ease2_transformer(pole: str = "N") -> pyproj.Transformer:
+    """
+    Get the shared WGS84 -> EASE-Grid 2.0 transformer for a pole
+
+    Transformers are built once per process and reused by every processor.
+
+    Args:
+        pole: 'N' for north (EPSG:6931), 'S' for south (EPSG:6932)
+
+    Returns:
+        pyproj Transformer with (lon, lat) axis order
+    """
+    with _transformer_lock:
+        return _create_ease2_transformer(pole)
+
+
+def _authalic_q(sin_lat):
+    """Snyder's q function of the authalic latitude on the WGS84 ellipsoid"""
+    e_sin = WGS84_E * sin_lat
+    return (1.0 - WGS84_E2) * (
+            sin_lat / (1.0 - e_sin ** 2) -
+            np.log((1.0 - e_sin) / (1.0 + e_sin)) / (2.0 * WGS84_E)
+    )
+
+
+_Q_POLE = _authalic_q(1.0)
+
+
+def latlon_to_ease2_analytic(lat, lon, pole: str = "N"):
+    """
+    Polar Lambert azimuthal equal-area forward transform in NumPy
+
+    Implements the ellipsoidal polar aspect (Snyder, Map Projections - A
+    Working Manual) with the EASE-Grid 2.0 parameters: WGS84, central
+    meridian 0, no false easting/northing. Agrees with pyproj on
+    EPSG:6931/6932 to about a micrometre more than 10 km from the poles
+    and to a few centimetres closer in, where both lose precision in
+    q_p - q. Within about a metre of the poles PROJ snaps points onto the
+    pole, a difference of up to 0.2 m.
+
+    Args:
+        lat: Latitude in degrees
+        lon: Longitude in degrees
+        pole: 'N' or 'S'
+
+    Returns:
+        Tuple of (x, y) in metres, NaN where the latitude is invalid
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+
+    lat = np.where(np.abs(lat) <= 90.0, lat, np.nan)
+    lon_rad = np.radians(lon)
+
+    # The south aspect is the north one mirrored, q(-lat) = -q(lat)
+    sign = 1.0 if pole == "N" else -1.0
+    q = _authalic_q(np.sin(np.radians(sign * lat)))
+    rho = WGS84_A * np.sqrt(np.maximum(_Q_POLE - q, 0.0))
+
+    return rho * np.sin(lon_rad), -sign * rho * np.cos(lon_rad)
+
+
+def latlon_to_ease2(lat, lon, pole: str = "N", method: str = "analytic"):
+    """
+    Transform coordinates to EASE-Grid 2.0 North or South
+
+    Args:
+        lat: Latitude in degrees
+        lon: Longitude in degrees
+        pole: 'N' or 'S'
+        method: 'analytic' for the NumPy fast path, 'pyproj' for PROJ
+
+    Returns:
+        Tuple of (x, y) in metres, NaN where the transform is undefined
+    """
+    if method == "analytic":
+        return latlon_to_ease2_analytic(lat, lon, pole)
+
+    x, y = get_ease2_transformer(pole).transform(lon, lat)
+    x = np.where(np.isinf(x), np.nan, x)
+    y = np.where(np.isinf(y), np.nan, y)
+    return x, y
+
+
+def hemisphere_scan_range(lat: np.ndarray, pole: str = "N", halo: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Range of scan lines that can land on a pole's grid
+
+    A scan line (row of a swath) is kept when its latitude extent reaches
+    the requested hemisphere, i.e. its maximum latitude is >= 0 for the
+    north grid or its minimum latitude is <= 0 for the south grid. The
+    per-sample hemisphere mask still applies to the rows that are kept.
+
+    Args:
+        lat: Swath latitude in degrees, scan lines along the first axis
+        pole: 'N' or 'S'
+        halo: Extra scan lines to keep on each side
+
+    Returns:
+        Tuple of (start, stop) row indices, or None if no scan line qualifies
+    """
+    if pole == "N":
+        rows_in_hemisphere = np.any(lat >= 0, axis=1)
+    else:  # pole == "S"
+        rows_in_hemisphere = np.any(lat <= 0, axis=1)
+
+    rows = np.flatnonzero(rows_in_hemisphere)
+    if len(rows) == 0:
+        return None
+
+    start = max(0, int(rows[0]) - halo)
+    stop = min(lat.shape[0], int(rows[-1]) + 1 + halo)
+    return start, stop
@@ -0,0 +1,104 @@
+"""
+Persistent cache of swath-to-grid pixel indices
+Granule geolocation never changes, so its projection onto a grid is computed once
+"""
+
+import os
+import pathlib
+import numpy as np
+from typing import Optional, Tuple
+
+from utils.file_manager import evict_least_recently_used
+
+# Total size of cached indices above which the least recently used are deleted
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+
+# Part of every entry name; bump when the stored mapping changes meaning
+INDEX_FORMAT_VERSION = 1
+
+
+class SwathIndexCache:
+    """On-disk cache of valid-sample masks and flat grid indices per granule"""
+
+    def __init__(self, cache_dir: pathlib.Path, max_bytes: int = MAX_CACHE_BYTES):
+        """
+        Initialize swath index cache
+
+        Args:
+            cache_dir: Directory holding the cached index files
+            max_bytes: Total size of cached files above which the least
+                recently used entries are deleted
+        """
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, granule_id: str, pole: str, grid_shape: Tuple[int, int],
+                    pixel_size_m: float, projection_method: str) -> pathlib.Path:
+        """Cache file for one (granule, pole, grid resolution, projection method) combination"""
+        height, width = grid_shape
+        return self.cache_dir / (f"{granule_id}_{pole}_{width}x{height}_{int(round(pixel_size_m))}m_"
+                                 f"{projection_method}_v{INDEX_FORMAT_VERSION}.npz")
+
+    def load(self, granule_id: str, pole: str, grid_shape: Tuple[int, int],
+             pixel_size_m: float, projection_method: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Load the cached mapping of a granule
+
+        Args:
+            granule_id: Granule identifier (HDF5 file stem)
+            pole: 'N' or 'S'
+            grid_shape: (height, width) of the target grid
+            pixel_size_m: Grid pixel size in metres
+            projection_method: Projection that computed the mapping ('analytic' or 'pyproj')
+
+        Returns:
+            Tuple of (valid-sample mask, flat pixel index per valid sample) or None
+        """
+        path = self._entry_path(granule_id, pole, grid_shape, pixel_size_m, projection_method)
+        if not path.exists():
+            return None
+
+        try:
+            with np.load(path) as entry:
+                shape = tuple(entry['swath_shape'])
+                valid_mask = np.unpackbits(entry['valid_mask'], count=int(np.prod(shape)))
+                pixel_index = entry['pixel_index']
+
+            # Mark as recently used
+            os.utime(path)
+            return valid_mask.astype(bool).reshape(shape), pixel_index
+        except Exception as e:
+            print(f"Ignoring unreadable index cache {path.name}: {e}")
+            return None
+
+    def save(self, granule_id: str, pole: str, grid_shape: Tuple[int, int], pixel_size_m: float,
+             projection_method: str, valid_mask: np.ndarray, pixel_index: np.ndarray):
+        """
+        Store the mapping of a granule, deleting the least recently used beyond max_bytes
+
+        Args:
+            granule_id: Granule identifier (HDF5 file stem)
+            pole: 'N' or 'S'
+            grid_shape: (height, width) of the target grid
+            pixel_size_m: Grid pixel size in metres
+            projection_method: Projection that computed the mapping ('analytic' or 'pyproj')
+            valid_mask: Boolean mask of swath samples that land on the grid
+            pixel_index: Flat grid index of each valid sample, in row-major sample order
+        """
+        path = self._entry_path(granule_id, pole, grid_shape, pixel_size_m, projection_method)
+        tmp_path = path.with_suffix(".tmp.npz")
+
+        try:
+            np.savez_compressed(
+                tmp_path,
+                swath_shape=np.asarray(valid_mask.shape),
+                valid_mask=np.packbits(valid_mask.ravel()),
+                pixel_index=pixel_index.astype(np.int32)
+            )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Could not write index cache {path.name}: {e}")
+            return
+
+        evict_least_recently_used(self.cache_dir, self.max_bytes, "*.npz", keep=path)
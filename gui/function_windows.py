@@ -5,6 +5,7 @@ Individual function windows for each processing task
 import tkinter as tk
 from tkinter import ttk, messagebox
 import datetime
+import os
 import threading
 from utils.validators import DateValidator
 from core.gportal_client import GPortalClient
@@ -82,13 +83,19 @@ class BaseFunctionWindow:
             self.status_label.config(text=message, fg="green")
         messagebox.showinfo("Success", message)
 
+    def show_warning(self, message):
+        """Show warning message"""
+        if hasattr(self, 'status_label'):
+            self.status_label.config(text=message, fg="orange")
+        messagebox.showwarning("Warning", message)
+
 
 class PolarCircleWindow(BaseFunctionWindow):
     """Window for creating circular polar images"""
 
     def __init__(self, parent, auth_manager, path_manager, file_manager):
         super().__init__(parent, auth_manager, path_manager, file_manager, "Polar Circle")
-        self.center_window(500, 350)
+        self.center_window(500, 430)
         self.create_widgets()
 
     def create_widgets(self):
@@ -158,6 +165,26 @@ class PolarCircleWindow(BaseFunctionWindow):
             value="S"
         ).pack(side="left", padx=5)
 
+        # Gridding processes, one per CPU by default
+        cpu_count = os.cpu_count() or 1
+        ttk.Label(form_frame, text="Workers:").grid(row=3, column=0, sticky="e", pady=10)
+        self.workers_var = tk.IntVar(value=cpu_count)
+        ttk.Spinbox(
+            form_frame,
+            from_=1,
+            to=cpu_count,
+            textvariable=self.workers_var,
+            width=5
+        ).grid(row=3, column=1, pady=10, padx=10, sticky="w")
+
+        # float32 compensated accumulators, half the grid memory
+        self.compact_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            form_frame,
+            text="Low-memory grid",
+            variable=self.compact_var
+        ).grid(row=4, column=1, pady=5, padx=10, sticky="w")
+
         # Buttons frame
         button_frame = ttk.Frame(self.window)
         button_frame.pack(pady=20)
@@ -196,6 +223,14 @@ class PolarCircleWindow(BaseFunctionWindow):
         orbit_type = self.orbit_var.get()
         pole = self.pole_var.get()
 
+        try:
+            workers = int(self.workers_var.get())
+        except (tk.TclError, ValueError):
+            self.show_error("Workers must be a whole number")
+            return
+        self.image_processor.workers = max(1, workers)
+        self.image_processor.compact_accumulators = self.compact_var.get()
+
         # Validate date
         validator = DateValidator()
         is_valid, error_msg, date_obj = validator.validate_date(date_str)
@@ -235,19 +270,38 @@ class PolarCircleWindow(BaseFunctionWindow):
 
             self.window.after(0, self.show_progress, f"Found {len(available_files)} files. Downloading...")
 
+            # Granules gridded by an earlier run of this day are not downloaded again
+            included = self.image_processor.included_granules(date_str, orbit_type, pole)
+            new_names = [f['name'] for f in available_files if f['name'] not in included]
+
             # Download files to temp directory
             temp_dir = self.file_manager.get_temp_dir()
-            downloaded_files = self.gportal_client.download_files(
-                date_str,
-                orbit_type,
-                temp_dir,
-                progress_callback=lambda msg: self.window.after(0, self.show_progress, msg)
-            )
+            downloaded_files = []
+            if new_names:
+                downloaded_files = self.gportal_client.download_files(
+                    date_str,
+                    orbit_type,
+                    temp_dir,
+                    progress_callback=lambda msg: self.window.after(0, self.show_progress, msg),
+                    skip_names=included
+                )
+            else:
+                self.window.after(0, self.show_progress,
+                                  f"No new granules, reusing {len(included)} accumulated granules")
 
-            if not downloaded_files:
+            if not downloaded_files and not included:
                 self.window.after(0, self.show_error, "Failed to download files")
                 return
 
+            # Without this, an image of only the stored granules would look up to date
+            warning = None
+            failed = len(new_names) - len(downloaded_files)
+            if failed > 0:
+                warning = (f"{failed} of {len(new_names)} new granules could not be downloaded, "
+                           f"the image includes {len(included) + len(downloaded_files)} "
+                           f"of {len(available_files)} granules")
+                print(f"Warning: {warning}")
+
             # Process files to create polar image
             self.window.after(0, self.show_progress, "Creating polar image...")
 
@@ -261,7 +315,8 @@ class PolarCircleWindow(BaseFunctionWindow):
             result_data = self.image_processor.create_polar_image(
                 downloaded_files,
                 orbit_type,
-                pole
+                pole,
+                date_str=date_str
             )
 
             if result_data is None:
@@ -300,11 +355,11 @@ class PolarCircleWindow(BaseFunctionWindow):
             self.file_manager.cleanup_temp()
 
             # Success
-            self.window.after(
-                0,
-                self.show_success,
-                f"Processing complete!\nResults saved to:\n{output_dir}"
-            )
+            message = f"Processing complete!\nResults saved to:\n{output_dir}"
+            if warning is not None:
+                self.window.after(0, self.show_warning, f"{message}\n\nWarning: {warning}")
+            else:
+                self.window.after(0, self.show_success, message)
 
             # Close window after short delay
             self.window.after(1500, self.on_close)
@@ -607,13 +662,37 @@ class SingleStripWindow(BaseFunctionWindow):
 # Add these imports at the top of function_windows.py
 from core.enhanced_processor import EnhancedProcessor
 from ml_models import TemperatureSRProcessor
+from ml_models.config import load_config
+from ml_models.model_registry import default_checkpoint_path, model_registry
 import numpy as np
+import contextlib
 import pathlib
 
 
+class SharedModelWindow(BaseFunctionWindow):
+    """Base class for windows running the shared enhancement model"""
+
+    def __init__(self, parent, auth_manager, path_manager, file_manager, title):
+        super().__init__(parent, auth_manager, path_manager, file_manager, title)
+
+        # Shared ML model, loaded in the background by the registry
+        self.model_path = default_checkpoint_path()
+        self.model_loaded = self.model_path.exists()
+        if self.model_loaded:
+            model_registry.warm_up(self.model_path)
+
+    @contextlib.contextmanager
+    def use_model(self):
+        """Hold the shared model for one job, loading it with progress if needed (runs in thread)"""
+        if not model_registry.is_loaded(self.model_path):
+            self.window.after(0, self.show_progress, "Loading enhancement model...")
+        with model_registry.acquire(self.model_path) as enhanced_processor:
+            yield enhanced_processor
+
+
 # Replace the Enhance8xWindow class implementation:
 
-class Enhance8xWindow(BaseFunctionWindow):
+class Enhance8xWindow(SharedModelWindow):
     """Window for 8x quality enhancement of single strip"""
 
     def __init__(self, parent, auth_manager, path_manager, file_manager):
@@ -621,23 +700,6 @@ class Enhance8xWindow(BaseFunctionWindow):
         self.center_window(600, 500)
         self.available_files = []
 
-        # Initialize ML processor
-        if getattr(sys, 'frozen', False):
-            model_path = pathlib.Path(sys._MEIPASS) / "ml_models" / "checkpoints" / "net_g_45738.pth"
-        else:
-            model_path = pathlib.Path(__file__).parent.parent / "ml_models" / "checkpoints" / "net_g_45738.pth"
-        if model_path.exists():
-            if torch is not None:
-                device_obj, device_name = get_best_device()
-                self.enhanced_processor = EnhancedProcessor(model_path, device=str(device_obj))
-                print(f"Enhancement model loaded on: {device_name}")
-            else:
-                self.enhanced_processor = EnhancedProcessor(model_path, device='cpu')
-            self.model_loaded = True
-        else:
-            self.enhanced_processor = None
-            self.model_loaded = False
-
         self.create_widgets()
 
     def create_widgets(self):
@@ -893,39 +955,42 @@ class Enhance8xWindow(BaseFunctionWindow):
                 self.window.after(0, self.show_error, "Failed to extract temperature data")
                 return
 
-            # Extract coordinates
-            self.window.after(0, self.show_progress, "Extracting coordinates...")
+            with self.use_model() as enhanced_processor:
+                # Extract coordinates
+                self.window.after(0, self.show_progress, "Extracting coordinates...")
 
-            lat, lon = self.enhanced_processor.extract_coordinates_from_h5(downloaded_file)
+                lat, lon = enhanced_processor.extract_coordinates_from_h5(downloaded_file)
 
-            # Process with 8x enhancement
-            self.window.after(0, self.show_progress, "Applying 8x enhancement (this may take a few minutes)...")
+                # Process with 8x enhancement
+                self.window.after(0, self.show_progress, "Applying 8x enhancement (this may take a few minutes)...")
 
-            metadata = {
-                'filename': file_info['name'],
-                'orbit_type': file_info.get('orbit_type', 'unknown'),
-                'scale_factor': scale_factor
-            }
+                metadata = {
+                    'filename': file_info['name'],
+                    'orbit_type': file_info.get('orbit_type', 'unknown'),
+                    'scale_factor': scale_factor
+                }
 
-            # Run 8x enhancement
-            enhanced_results = self.enhanced_processor.sr_processor.process_single_strip_8x(
-                temp_data, lat, lon, metadata
-            )
+                # Run 8x enhancement
+                enhanced_results = enhanced_processor.sr_processor.process_single_strip_8x(
+                    temp_data, lat, lon, metadata,
+                    granule_id=pathlib.Path(file_info['name']).stem,
+                    channel=self.data_handler.var_name
+                )
 
-            # Create output directory
-            date_str = self.date_entry.get().strip().replace("/", "-")
-            output_base = self.path_manager.get_output_path()
-            output_dir = output_base / f"Enhanced8x-{date_str}"
+                # Create output directory
+                date_str = self.date_entry.get().strip().replace("/", "-")
+                output_base = self.path_manager.get_output_path()
+                output_dir = output_base / f"Enhanced8x-{date_str}"
 
-            # Save results
-            self.window.after(0, self.show_progress, "Saving enhanced results...")
+                # Save results
+                self.window.after(0, self.show_progress, "Saving enhanced results...")
 
-            self.enhanced_processor.save_enhanced_results(
-                enhanced_results,
-                output_dir,
-                file_info['name'].replace('.h5', ''),
-                percentile_filter=True  # Apply 1-99 percentile filter
-            )
+                enhanced_processor.save_enhanced_results(
+                    enhanced_results,
+                    output_dir,
+                    file_info['name'].replace('.h5', ''),
+                    percentile_filter=True  # Apply 1-99 percentile filter
+                )
 
             # Clean up
             self.window.after(0, self.show_progress, "Cleaning up...")
@@ -956,29 +1021,12 @@ class Enhance8xWindow(BaseFunctionWindow):
 # Replace the PolarEnhanced8xWindow class implementation:
 
 
-class PolarEnhanced8xWindow(BaseFunctionWindow):
+class PolarEnhanced8xWindow(SharedModelWindow):
     """Window for 8x enhanced polar circle"""
 
     def __init__(self, parent, auth_manager, path_manager, file_manager):
         super().__init__(parent, auth_manager, path_manager, file_manager, "8x Enhanced Polar")
-        self.center_window(500, 350)
-
-        # Initialize ML processor
-        if getattr(sys, 'frozen', False):
-            model_path = pathlib.Path(sys._MEIPASS) / "ml_models" / "checkpoints" / "net_g_45738.pth"
-        else:
-            model_path = pathlib.Path(__file__).parent.parent / "ml_models" / "checkpoints" / "net_g_45738.pth"
-        if model_path.exists():
-            if torch is not None:
-                device_obj, device_name = get_best_device()
-                self.enhanced_processor = EnhancedProcessor(model_path, device=str(device_obj))
-                print(f"Enhancement model loaded on: {device_name}")
-            else:
-                self.enhanced_processor = EnhancedProcessor(model_path, device='cpu')
-            self.model_loaded = True
-        else:
-            self.enhanced_processor = None
-            self.model_loaded = False
+        self.center_window(500, 380)
 
         self.create_widgets()
 
@@ -1069,6 +1117,14 @@ class PolarEnhanced8xWindow(BaseFunctionWindow):
             value="S"
         ).pack(side="left", padx=5)
 
+        # float32 compensated accumulators, half the 8x grid memory
+        self.compact_var = tk.BooleanVar(value=load_config()['inference']['compact_accumulators'])
+        ttk.Checkbutton(
+            form_frame,
+            text="Low-memory grid",
+            variable=self.compact_var
+        ).grid(row=3, column=1, pady=5, padx=10, sticky="w")
+
         # Buttons frame
         button_frame = ttk.Frame(self.window)
         button_frame.pack(pady=20)
@@ -1122,12 +1178,12 @@ class PolarEnhanced8xWindow(BaseFunctionWindow):
         # Process in thread
         thread = threading.Thread(
             target=self.process_polar_enhanced,
-            args=(date_obj, orbit_type, pole)
+            args=(date_obj, orbit_type, pole, self.compact_var.get())
         )
         thread.daemon = True
         thread.start()
 
-    def process_polar_enhanced(self, date_obj, orbit_type, pole):
+    def process_polar_enhanced(self, date_obj, orbit_type, pole, compact_accumulators=False):
         """Process enhanced polar circle"""
         try:
             # Convert date
@@ -1159,16 +1215,18 @@ class PolarEnhanced8xWindow(BaseFunctionWindow):
                 self.window.after(0, self.show_error, "Failed to download files")
                 return
 
-            # Process with 8x enhancement
-            self.window.after(0, self.show_progress,
-                              "Applying 8x enhancement to polar projection (this may take several minutes)...")
-
-            # Use the ML processor to create enhanced polar image
-            enhanced_result = self.enhanced_processor.sr_processor.process_polar_8x_enhanced(
-                downloaded_files,
-                orbit_type,
-                pole
-            )
+            with self.use_model() as enhanced_processor:
+                # Process with 8x enhancement
+                self.window.after(0, self.show_progress,
+                                  "Applying 8x enhancement to polar projection (this may take several minutes)...")
+
+                # Use the ML processor to create enhanced polar image
+                enhanced_result = enhanced_processor.sr_processor.process_polar_8x_enhanced(
+                    downloaded_files,
+                    orbit_type,
+                    pole,
+                    compact_accumulators=compact_accumulators
+                )
 
             # Create output directory
             output_base = self.path_manager.get_output_path()
@@ -6,6 +6,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
 import pathlib
+import threading
 '''
 from gui.function_windows import (
     PolarCircleWindow,
@@ -22,6 +23,9 @@ from gui.function_windows_server import (
 )
 from utils.file_manager import FileManager
 
+# How often the shared enhancement models are checked against memory pressure
+MODEL_TRIM_INTERVAL_MS = 60000
+
 
 class MainWindow:
     """Main application window"""
@@ -57,6 +61,10 @@ class MainWindow:
         # Create UI
         self.create_widgets()
 
+        # Warm up the enhancement model once the menu is shown
+        self.root.after_idle(self.warm_up_models)
+        self.root.after(MODEL_TRIM_INTERVAL_MS, self.trim_models)
+
     def center_window(self):
         """Center the window on screen"""
         self.root.update_idletasks()
@@ -141,6 +149,31 @@ class MainWindow:
         )
         self.status_bar.pack(side="bottom", fill="x")
 
+    def warm_up_models(self):
+        """Load the shared enhancement model in the background"""
+
+        def load():
+            # Importing ml_models pulls in PyTorch, keep that off the Tk thread too
+            try:
+                from ml_models.model_registry import model_registry
+                model_registry.warm_up()
+            except ImportError as e:
+                print(f"Enhancement model not available: {e}")
+
+        threading.Thread(target=load, name="model-warm-up", daemon=True).start()
+
+    def trim_models(self):
+        """Release the shared enhancement models under memory pressure"""
+        # Only once the warm-up has imported the registry
+        registry = sys.modules.get("ml_models.model_registry")
+        if registry is not None:
+            try:
+                registry.model_registry.trim()
+            except Exception as e:
+                print(f"Could not check memory: {e}")
+
+        self.root.after(MODEL_TRIM_INTERVAL_MS, self.trim_models)
+
     def create_tooltip(self, widget, text):
         """Create tooltip for widget"""
 
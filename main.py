@@ -7,6 +7,7 @@ A desktop application for processing AMSR-2 satellite data
 import os
 import sys
 import pathlib
+import multiprocessing
 import tkinter as tk
 from tkinter import messagebox
 import sys
@@ -172,4 +173,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the gridding process pool in the frozen executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+CPU benchmark of the SwinIR attention paths
+Compares the reference attention with the fused scaled_dot_product_attention path
+
+Usage:
+    python -m ml_models.benchmark --height 96 --width 96 --batch 1 --repeats 3
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+from typing import Dict
+
+import torch
+
+from .config import load_config
+from .network_swinir import set_fused_attention
+from .temperature_sr_model import TemperatureSRModel
+
+
+def build_model(device: str = "cpu") -> torch.nn.Module:
+    """Randomly initialized SwinIR generator with the production configuration"""
+    opt = load_config()
+    opt['device'] = device
+    torch.manual_seed(0)
+    return TemperatureSRModel(opt).net_g.eval()
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB, NaN where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return float('nan')
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB on Linux, bytes on macOS
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def time_forward(model: torch.nn.Module, x: torch.Tensor, repeats: int) -> float:
+    """Mean seconds per forward pass after one warm-up pass"""
+    with torch.no_grad():
+        model(x)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model(x)
+    return (time.perf_counter() - start) / repeats
+
+
+def _run_variant(fused: bool, height: int, width: int, batch: int,
+                 repeats: int, threads: int, queue):
+    """Benchmark one attention path in a fresh process so peak memory is its own"""
+    torch.set_num_threads(threads)
+    model = build_model()
+    set_fused_attention(model, fused)
+    x = torch.rand(batch, 1, height, width, generator=torch.Generator().manual_seed(0))
+
+    rss_before = _peak_rss_mb()
+    seconds = time_forward(model, x, repeats)
+    queue.put({'seconds': seconds, 'peak_rss_mb': _peak_rss_mb(), 'baseline_rss_mb': rss_before})
+
+
+def compare_outputs(height: int, width: int, batch: int) -> float:
+    """Largest absolute difference between the fused and reference outputs"""
+    model = build_model()
+    x = torch.rand(batch, 1, height, width, generator=torch.Generator().manual_seed(0))
+
+    with torch.no_grad():
+        set_fused_attention(model, False)
+        reference = model(x)
+        set_fused_attention(model, True)
+        fused = model(x)
+
+    return float((fused - reference).abs().max())
+
+
+def run_benchmark(height: int = 96, width: int = 96, batch: int = 1,
+                  repeats: int = 3, threads: int = None) -> Dict[str, Dict]:
+    """
+    Time both attention paths and measure their peak memory
+
+    Args:
+        height: Patch height
+        width: Patch width
+        batch: Patches per forward pass
+        repeats: Timed forward passes per path
+        threads: Torch CPU threads, torch default if None
+
+    Returns:
+        Dictionary of results per path plus the maximum output difference
+    """
+    threads = threads or torch.get_num_threads()
+    context = multiprocessing.get_context("spawn")
+    results = {}
+
+    for name, fused in (("reference", False), ("fused", True)):
+        queue = context.Queue()
+        process = context.Process(
+            target=_run_variant, args=(fused, height, width, batch, repeats, threads, queue)
+        )
+        process.start()
+        results[name] = queue.get()
+        process.join()
+
+    results['max_abs_diff'] = compare_outputs(height, width, batch)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SwinIR attention paths on CPU")
+    parser.add_argument("--height", type=int, default=96)
+    parser.add_argument("--width", type=int, default=96)
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.height, args.width, args.batch, args.repeats, args.threads)
+
+    print(f"Input {args.batch}x1x{args.height}x{args.width}, "
+          f"{args.threads or torch.get_num_threads()} threads")
+    for name in ("reference", "fused"):
+        r = results[name]
+        print(f"  {name:9s}: {r['seconds'] * 1000:8.1f} ms/forward, "
+              f"peak RSS {r['peak_rss_mb']:.0f} MB (+{r['peak_rss_mb'] - r['baseline_rss_mb']:.0f} MB)")
+    print(f"  speedup  : {results['reference']['seconds'] / results['fused']['seconds']:.2f}x")
+    print(f"  max |fused - reference| = {results['max_abs_diff']:.2e}")
+
+
+if __name__ == "__main__":
+    main()
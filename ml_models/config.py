@@ -43,6 +43,58 @@ def load_config():
                 'betas': [0.9, 0.99]
             }
         },
+        'inference': {
+            # Activation memory budget for one batch of patches
+            'batch_memory_mb': 2048,
+            'max_batch_size': 16,
+            # Patch tiling: 'halo' plans the fewest patches overlapping by
+            # 2 * patch_halo input pixels and only feathers the overlaps;
+            # 'gaussian' is the fixed 75% overlap tiling with Gaussian blending
+            'blend': 'halo',
+            'patch_halo': 16,
+            # 'eager', 'torchscript' or 'onnx' (ONNX Runtime, optional). Exports
+            # are made per patch shape, cached in the user cache directory, and
+            # fall back to eager mode if they fail
+            'backend': 'eager',
+            # 'float32', 'bfloat16' (autocast) or 'int8' (dynamic quantization
+            # of the nn.Linear layers, CPU only). Reduced precisions are only
+            # used after passing the accuracy gate against float32
+            'precision': 'float32',
+            'precision_gate': {
+                'reference_rows': 128,
+                'max_rmse_k': 0.5,
+                'min_psnr': 40.0,
+                'min_ssim': 0.98
+            },
+            # Bicubic instead of SwinIR for patches whose spread is below
+            # threshold_k: 'std' is the patch standard deviation, 'gradient'
+            # the RMS difference of neighbouring pixels, both in K. Every
+            # audit_every-th skipped patch also runs the network to measure
+            # the error of skipping
+            'flat_gate': {
+                'enabled': False,
+                'metric': 'std',
+                'threshold_k': 0.5,
+                'audit_every': 10
+            },
+            # Persistent 8x results per granule, channel, scan line window,
+            # checkpoint and settings; 'float16' halves the size at about
+            # range / 2048 K resolution
+            'result_cache': {
+                'enabled': True,
+                'max_gb': 20,
+                'dtype': 'float32'
+            },
+            # CPU worker processes enhancing polar granules at once, each with
+            # its own model replica and threads_per_worker intra-op threads
+            # (the CPU count divided by workers if None); 1 enhances in the
+            # calling process
+            'workers': 1,
+            'threads_per_worker': None,
+            # Grid polar days into float32 compensated sums and a uint16 count,
+            # 10 instead of 20 bytes per pixel of the 8x grid
+            'compact_accumulators': False
+        },
         'is_train': False,
         'dist': False
     }
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Exported SwinIR inference backends
+Traces the generator once per fixed input shape to TorchScript or ONNX and caches the export in the user cache
+"""
+
+import inspect
+import io
+import logging
+import os
+import warnings
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import torch
+
+from .network_swinir import set_fused_attention
+from .sr_cache import checkpoint_digest
+
+logger = logging.getLogger(__name__)
+
+# 'eager' runs the nn.Module directly and is the fallback of the others
+BACKENDS = ('eager', 'torchscript', 'onnx')
+
+# ONNX opset of the exports; the reference attention path exports with it
+ONNX_OPSET = 17
+
+
+class ExportedGenerator:
+    """SwinIR generator exported per input shape, falling back to eager mode"""
+
+    def __init__(self, net_g: torch.nn.Module, checkpoint_path: Path,
+                 backend: str = 'torchscript', device: torch.device = torch.device('cpu'),
+                 export_dir: Optional[Path] = None):
+        """
+        Initialize exported generator
+
+        Args:
+            net_g: Loaded generator in eval mode
+            checkpoint_path: Checkpoint the weights came from; exports are
+                keyed by its contents
+            backend: 'torchscript' or 'onnx' (ONNX Runtime, CPU only)
+            device: Inference device
+            export_dir: Directory of the cached exports, the 'model_exports'
+                cache directory if None
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+        self.net_g = net_g
+        self.checkpoint_path = Path(checkpoint_path)
+        self.device = torch.device(device)
+        self.backend = backend
+
+        # Not beside the checkpoint, which is in a per-launch temp dir when frozen
+        if export_dir is None:
+            from utils.file_manager import FileManager
+            export_dir = FileManager().get_cache_dir("model_exports")
+        self.export_dir = Path(export_dir)
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+
+        if backend == 'onnx':
+            try:
+                import onnxruntime  # noqa: F401
+            except ImportError:
+                logger.warning("onnxruntime is not installed, using TorchScript")
+                self.backend = 'torchscript'
+
+            if self.device.type != 'cpu':
+                logger.warning("ONNX Runtime backend is CPU only, using TorchScript")
+                self.backend = 'torchscript'
+
+        # Runner per input shape, None where export failed and eager mode is used
+        self._runners: Dict[Tuple[int, ...], Optional[Callable]] = {}
+
+    def __call__(self, batch: torch.Tensor) -> torch.Tensor:
+        """Forward pass of a B x 1 x H x W batch"""
+        shape = tuple(batch.shape)
+
+        if shape not in self._runners:
+            self._runners[shape] = self._load_or_export(shape)
+
+        runner = self._runners[shape]
+        if runner is None:
+            return self.net_g(batch)
+        return runner(batch)
+
+    def export_path(self, shape: Tuple[int, ...]) -> Path:
+        """Cached export of one input shape, named after the checkpoint contents"""
+        suffix = "onnx" if self.backend == 'onnx' else "pt"
+        dims = "x".join(str(d) for d in shape)
+        digest = checkpoint_digest(self.checkpoint_path)[:16]
+        return self.export_dir / (
+            f"{self.checkpoint_path.stem}.{digest}.{self.backend}.{self.device.type}.{dims}.{suffix}"
+        )
+
+    def _load_or_export(self, shape: Tuple[int, ...]) -> Optional[Callable]:
+        """Runner for one input shape from the cached export, exporting it first if needed"""
+        path = self.export_path(shape)
+
+        try:
+            if path.exists():
+                try:
+                    runner = self._load(path.read_bytes())
+                    logger.info(f"Loaded {self.backend} export {path.name}")
+                    return runner
+                except Exception as e:
+                    logger.warning(f"Re-exporting unreadable {path.name}: {e}")
+
+            data = self._export(shape)
+            self._write(path, data)
+            logger.info(f"Exported generator to {self.backend} for input {shape}")
+            return self._load(data)
+
+        except Exception as e:
+            logger.warning(f"{self.backend} backend unavailable for input {shape}, using eager mode: {e}")
+            return None
+
+    def _export(self, shape: Tuple[int, ...]) -> bytes:
+        """Serialized export of the generator for one input shape"""
+        example = torch.zeros(shape, dtype=torch.float32, device=self.device)
+        buffer = io.BytesIO()
+
+        with torch.no_grad(), warnings.catch_warnings():
+            # Shape arithmetic is frozen into the trace on purpose
+            warnings.simplefilter("ignore", torch.jit.TracerWarning)
+
+            if self.backend == 'torchscript':
+                traced = torch.jit.trace(self.net_g, example, check_trace=False)
+                torch.jit.save(torch.jit.freeze(traced), buffer)
+            else:
+                self._export_onnx(example, buffer)
+
+        return buffer.getvalue()
+
+    def _export_onnx(self, example: torch.Tensor, buffer: io.BytesIO):
+        """ONNX export through the reference attention path"""
+        fused = [m.fused_attention for m in self.net_g.modules() if hasattr(m, 'fused_attention')]
+        set_fused_attention(self.net_g, False)
+
+        kwargs = {}
+        if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+            # The TorchScript-based exporter, which needs no onnxscript
+            kwargs['dynamo'] = False
+
+        try:
+            torch.onnx.export(self.net_g, example, buffer, opset_version=ONNX_OPSET,
+                              input_names=['input'], output_names=['output'], **kwargs)
+        finally:
+            if fused:
+                set_fused_attention(self.net_g, fused[0])
+
+    def _load(self, data: bytes) -> Callable:
+        """Runner from a serialized export"""
+        if self.backend == 'torchscript':
+            return torch.jit.load(io.BytesIO(data), map_location=self.device)
+
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = torch.get_num_threads()
+        session = ort.InferenceSession(data, options, providers=['CPUExecutionProvider'])
+
+        def run(batch: torch.Tensor) -> torch.Tensor:
+            output, = session.run(None, {'input': batch.cpu().numpy()})
+            return torch.from_numpy(output)
+
+        return run
+
+    def _write(self, path: Path, data: bytes):
+        """Store an export atomically; the in-memory export is used if this fails"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache export {path.name}: {e}")
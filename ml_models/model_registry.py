@@ -0,0 +1,271 @@
+"""
+Process-wide registry of loaded enhancement models
+Every window shares one warm EnhancedProcessor per checkpoint and device
+"""
+
+import gc
+import logging
+import os
+import pathlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Checkpoint shipped with the application
+DEFAULT_CHECKPOINT_NAME = "net_g_45738.pth"
+
+# Loaded models are released when less system memory than this is available
+MIN_AVAILABLE_MEMORY_MB = 2048
+
+
+def default_checkpoint_path() -> pathlib.Path:
+    """Path of the bundled SR checkpoint, inside the PyInstaller bundle when frozen"""
+    if getattr(sys, 'frozen', False):
+        base = pathlib.Path(sys._MEIPASS)
+    else:
+        base = pathlib.Path(__file__).parent.parent
+    return base / "ml_models" / "checkpoints" / DEFAULT_CHECKPOINT_NAME
+
+
+def default_device() -> str:
+    """Best available inference device, CPU if PyTorch device detection fails"""
+    try:
+        from utils.device_utils import get_best_device
+        device, _ = get_best_device()
+        return str(device)
+    except Exception as e:
+        logger.warning(f"Error detecting device: {e}")
+        return "cpu"
+
+
+def available_memory_mb() -> Optional[float]:
+    """Available system memory in MB, None where it cannot be determined"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 1024 ** 2
+    except ImportError:
+        pass
+
+    if sys.platform == "win32":
+        import ctypes
+
+        class MemoryStatusEx(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MemoryStatusEx()
+        status.dwLength = ctypes.sizeof(MemoryStatusEx)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys / 1024 ** 2
+        return None
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+class _Entry:
+    """One model being loaded or loaded"""
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.processor = None
+        self.error = None
+        # Jobs holding the processor through acquire()
+        self.users = 0
+
+
+class ModelRegistry:
+    """Loads each (checkpoint, device) model once and hands the same instance to every caller"""
+
+    def __init__(self, min_available_mb: float = MIN_AVAILABLE_MEMORY_MB):
+        """
+        Initialize model registry
+
+        Args:
+            min_available_mb: Available system memory below which trim() releases models
+        """
+        self.min_available_mb = min_available_mb
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(model_path: pathlib.Path, device: Optional[str]) -> Tuple[str, str]:
+        return str(pathlib.Path(model_path).resolve()), device or default_device()
+
+    def warm_up(self, model_path: pathlib.Path = None, device: str = None):
+        """
+        Start loading a model in a background thread
+
+        Does nothing if the checkpoint is missing or the model is already
+        loaded or loading.
+
+        Args:
+            model_path: Checkpoint, the bundled one if None
+            device: Inference device, the best available if None
+        """
+        model_path = model_path or default_checkpoint_path()
+        if not pathlib.Path(model_path).exists():
+            return
+
+        def load():
+            try:
+                self.get(model_path, device)
+            except Exception as e:
+                logger.warning(f"Background model loading failed: {e}")
+
+        threading.Thread(target=load, name="model-warm-up", daemon=True).start()
+
+    def is_loaded(self, model_path: pathlib.Path = None, device: str = None) -> bool:
+        """Whether a model is loaded and ready"""
+        key = self._key(model_path or default_checkpoint_path(), device)
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry is not None and entry.processor is not None
+
+    def get(self, model_path: pathlib.Path = None, device: str = None):
+        """
+        Shared processor of a model, loading it if needed
+
+        Blocks until the model is loaded, also when another thread is
+        loading it. Call it from a worker thread, not the Tk thread.
+
+        Args:
+            model_path: Checkpoint, the bundled one if None
+            device: Inference device, the best available if None
+
+        Returns:
+            EnhancedProcessor of the model
+        """
+        return self._load(model_path, device, hold=False).processor
+
+    @contextmanager
+    def acquire(self, model_path: pathlib.Path = None, device: str = None):
+        """
+        Shared processor held for the duration of a job
+
+        release() and trim() keep models that are held, so a low-memory trim
+        during a job neither frees them nor makes the next get() load a
+        second copy. Blocks like get() while the model loads.
+
+        Args:
+            model_path: Checkpoint, the bundled one if None
+            device: Inference device, the best available if None
+
+        Yields:
+            EnhancedProcessor of the model
+        """
+        entry = self._load(model_path, device, hold=True)
+        try:
+            yield entry.processor
+        finally:
+            with self._lock:
+                entry.users -= 1
+
+    def _load(self, model_path: Optional[pathlib.Path], device: Optional[str], hold: bool) -> _Entry:
+        """Entry of a loaded model, loading it or waiting for another thread's load if needed"""
+        model_path = model_path or default_checkpoint_path()
+        key = self._key(model_path, device)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            loader = entry is None
+            if loader:
+                entry = self._entries[key] = _Entry()
+            # Counted before the load so a trim cannot drop the entry in between
+            if hold:
+                entry.users += 1
+
+        if loader:
+            try:
+                from core.enhanced_processor import EnhancedProcessor
+
+                start = time.perf_counter()
+                entry.processor = EnhancedProcessor(pathlib.Path(model_path), device=key[1])
+                logger.info(f"Loaded {pathlib.Path(model_path).name} on {key[1]} "
+                            f"in {time.perf_counter() - start:.1f}s")
+            except Exception as e:
+                entry.error = e
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+
+        if entry.error is not None:
+            if hold:
+                with self._lock:
+                    entry.users -= 1
+            raise entry.error
+
+        return entry
+
+    def release(self, model_path: pathlib.Path = None, device: str = None):
+        """
+        Drop idle loaded models so their memory can be reclaimed
+
+        Models held by a running job (see acquire) are kept. The next get()
+        of a dropped model loads it again.
+
+        Args:
+            model_path: Checkpoint to release, all models if None
+            device: Device to release, all devices of the checkpoint if None
+        """
+        with self._lock:
+            path = str(pathlib.Path(model_path).resolve()) if model_path is not None else None
+            keys = [k for k, e in self._entries.items()
+                    if (path is None or (k[0] == path and (device is None or k[1] == device)))
+                    and e.ready.is_set() and e.users == 0]
+
+            for key in keys:
+                del self._entries[key]
+
+        if keys:
+            gc.collect()
+            try:
+                import torch
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except ImportError:
+                pass
+            logger.info(f"Released {len(keys)} model(s)")
+
+    def trim(self) -> bool:
+        """
+        Release all idle loaded models if system memory is low
+
+        Returns:
+            True if models were released
+        """
+        available = available_memory_mb()
+        if available is None or available >= self.min_available_mb:
+            return False
+
+        with self._lock:
+            idle = any(e.processor is not None and e.users == 0 for e in self._entries.values())
+        if not idle:
+            return False
+
+        logger.warning(f"Low memory ({available:.0f} MB available), releasing idle enhancement models")
+        self.release()
+        return True
+
+
+# Shared by every window of the application
+model_registry = ModelRegistry()
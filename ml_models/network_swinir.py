@@ -4,8 +4,12 @@
 # -----------------------------------------------------------------------------------
 
 import math
+import threading
+from collections import OrderedDict
+
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.utils.checkpoint as checkpoint
 from timm.layers import DropPath, to_2tuple, trunc_normal_
 
@@ -61,6 +65,26 @@ def window_reverse(windows, window_size, H, W):
     return x
 
 
+# Shifted-window attention masks for resolutions other than input_resolution,
+# shared by all blocks and bounded (LRU) since each mask grows with H * W
+MASK_CACHE_SIZE = 8
+_mask_cache = OrderedDict()
+_mask_cache_lock = threading.Lock()
+
+
+def clear_mask_cache():
+    """Drop all cached attention masks"""
+    with _mask_cache_lock:
+        _mask_cache.clear()
+
+
+def set_fused_attention(model, enabled=True):
+    """Switch every WindowAttention in model between the fused and reference paths"""
+    for module in model.modules():
+        if isinstance(module, WindowAttention):
+            module.fused_attention = enabled
+
+
 class WindowAttention(nn.Module):
     r""" Window based multi-head self attention (W-MSA) module with relative position bias.
     It supports both of shifted and non-shifted window.
@@ -73,6 +97,12 @@ class WindowAttention(nn.Module):
         qk_scale (float | None, optional): Override default qk scale of head_dim ** -0.5 if set
         attn_drop (float, optional): Dropout ratio of attention weight. Default: 0.0
         proj_drop (float, optional): Dropout ratio of output. Default: 0.0
+
+    In eval mode the relative position bias is gathered once and reused, and
+    attention runs through F.scaled_dot_product_attention (set
+    fused_attention = False to use the reference path). Only the (nH, N, N)
+    bias is cached; bias + shifted-window mask is built per call, since it
+    grows with the number of windows.
     """
 
     def __init__(self, dim, window_size, num_heads, qkv_bias=True, qk_scale=None, attn_drop=0., proj_drop=0.):
@@ -110,6 +140,29 @@ class WindowAttention(nn.Module):
         trunc_normal_(self.relative_position_bias_table, std=.02)
         self.softmax = nn.Softmax(dim=-1)
 
+        self.fused_attention = hasattr(F, 'scaled_dot_product_attention')
+        self._bias_cache = None
+        self._bias_cache_key = None
+
+    def get_relative_position_bias(self):
+        """Relative position bias (nH, Wh*Ww, Wh*Ww), cached while not training"""
+        table = self.relative_position_bias_table
+        key = (table.device, table.dtype, table._version)
+
+        if not self.training and self._bias_cache_key == key:
+            return self._bias_cache
+
+        relative_position_bias = table[self.relative_position_index.view(-1)].view(
+            self.window_size[0] * self.window_size[1], self.window_size[0] * self.window_size[1], -1)  # Wh*Ww,Wh*Ww,nH
+        relative_position_bias = relative_position_bias.permute(2, 0, 1).contiguous()  # nH, Wh*Ww, Wh*Ww
+
+        if self.training:
+            self._bias_cache, self._bias_cache_key = None, None
+        else:
+            self._bias_cache, self._bias_cache_key = relative_position_bias.detach(), key
+
+        return relative_position_bias
+
     def forward(self, x, mask=None):
         """
         Args:
@@ -120,12 +173,13 @@ class WindowAttention(nn.Module):
         qkv = self.qkv(x).reshape(B_, N, 3, self.num_heads, C // self.num_heads).permute(2, 0, 3, 1, 4)
         q, k, v = qkv[0], qkv[1], qkv[2]  # make torchscript happy (cannot use tensor as tuple)
 
+        if self.fused_attention and not self.training:
+            return self._forward_fused(q, k, v, mask)
+
         q = q * self.scale
         attn = (q @ k.transpose(-2, -1))
 
-        relative_position_bias = self.relative_position_bias_table[self.relative_position_index.view(-1)].view(
-            self.window_size[0] * self.window_size[1], self.window_size[0] * self.window_size[1], -1)  # Wh*Ww,Wh*Ww,nH
-        relative_position_bias = relative_position_bias.permute(2, 0, 1).contiguous()  # nH, Wh*Ww, Wh*Ww
+        relative_position_bias = self.get_relative_position_bias()
         attn = attn + relative_position_bias.unsqueeze(0)
 
         if mask is not None:
@@ -143,6 +197,36 @@ class WindowAttention(nn.Module):
         x = self.proj_drop(x)
         return x
 
+    def _forward_fused(self, q, k, v, mask=None):
+        """Inference attention through F.scaled_dot_product_attention"""
+        B_, nH, N, head_dim = q.shape
+
+        # scaled_dot_product_attention applies head_dim ** -0.5 itself
+        scale_correction = self.scale * math.sqrt(head_dim)
+        if scale_correction != 1.0:
+            q = q * scale_correction
+
+        relative_position_bias = self.get_relative_position_bias()
+
+        if mask is not None:
+            # Fold the windows into the head axis so bias + mask broadcasts
+            # over the batch; the sum is as large as the attention scores of
+            # one image, so it is not kept between calls
+            nW = mask.shape[0]
+            attn_mask = (relative_position_bias.unsqueeze(0) + mask.unsqueeze(1)).to(q.dtype)
+            attn_mask = attn_mask.view(1, nW * nH, N, N)
+            q = q.reshape(B_ // nW, nW * nH, N, head_dim)
+            k = k.reshape(B_ // nW, nW * nH, N, head_dim)
+            v = v.reshape(B_ // nW, nW * nH, N, head_dim)
+        else:
+            attn_mask = relative_position_bias.unsqueeze(0).to(q.dtype)
+
+        x = F.scaled_dot_product_attention(q, k, v, attn_mask=attn_mask)
+        x = x.reshape(B_, nH, N, head_dim).transpose(1, 2).reshape(B_, N, nH * head_dim)
+        x = self.proj(x)
+        x = self.proj_drop(x)
+        return x
+
     def extra_repr(self) -> str:
         return f'dim={self.dim}, window_size={self.window_size}, num_heads={self.num_heads}'
 
@@ -235,6 +319,25 @@ class SwinTransformerBlock(nn.Module):
 
         return attn_mask
 
+    def get_mask(self, x_size, device):
+        """Attention mask for x_size on device, built once per (H, W, window, shift, device)"""
+        key = (x_size[0], x_size[1], self.window_size, self.shift_size, str(device))
+
+        with _mask_cache_lock:
+            attn_mask = _mask_cache.get(key)
+            if attn_mask is not None:
+                _mask_cache.move_to_end(key)
+                return attn_mask
+
+        attn_mask = self.calculate_mask(x_size).to(device)
+
+        with _mask_cache_lock:
+            _mask_cache[key] = attn_mask
+            while len(_mask_cache) > MASK_CACHE_SIZE:
+                _mask_cache.popitem(last=False)
+
+        return attn_mask
+
     def forward(self, x, x_size):
         H, W = x_size
         B, L, C = x.shape
@@ -257,8 +360,11 @@ class SwinTransformerBlock(nn.Module):
         # W-MSA/SW-MSA (to be compatible for testing on images whose shapes are the multiple of window size
         if self.input_resolution == x_size:
             attn_windows = self.attn(x_windows, mask=self.attn_mask)  # nW*B, window_size*window_size, C
+        elif self.shift_size > 0:
+            attn_windows = self.attn(x_windows, mask=self.get_mask(x_size, x.device))
         else:
-            attn_windows = self.attn(x_windows, mask=self.calculate_mask(x_size).to(x.device))
+            # unshifted windows never mix regions, so their mask would be all zeros
+            attn_windows = self.attn(x_windows, mask=None)
 
         # merge windows
         attn_windows = attn_windows.view(-1, self.window_size, self.window_size, C)
@@ -0,0 +1,191 @@
+"""
+Persistent cache of 8x super-resolution results
+A granule enhanced once, for a strip or a polar day, is read back instead of rerunning the cascade
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.file_manager import evict_least_recently_used
+
+logger = logging.getLogger(__name__)
+
+# Rows of an entry copied or decoded at once
+COPY_ROWS = 2048
+
+
+@lru_cache(maxsize=None)
+def _file_sha256(path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checkpoint_digest(model_path: pathlib.Path) -> str:
+    """
+    SHA-256 of a checkpoint file, computed once per process and file version
+
+    Args:
+        model_path: Checkpoint path
+
+    Returns:
+        Hex digest of the file contents
+    """
+    stat = os.stat(model_path)
+    return _file_sha256(str(pathlib.Path(model_path).resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def settings_digest(settings: Dict) -> str:
+    """Short digest of the inference settings that change SR output"""
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:8]
+
+
+class SRResultCache:
+    """Size-bounded on-disk LRU cache of 8x SR outputs, memory-mapped on load"""
+
+    def __init__(self, cache_dir: pathlib.Path, max_bytes: int, dtype: str = "float32"):
+        """
+        Initialize SR result cache
+
+        Args:
+            cache_dir: Directory holding the cached results
+            max_bytes: Total size of stored results above which the least
+                recently used entries are evicted
+            dtype: 'float32' stores temperatures as computed; 'float16' stores
+                them normalized to the entry's range, half the size at about
+                range / 2048 K resolution
+        """
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported cache dtype '{dtype}'")
+
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+
+    @staticmethod
+    def _slug(text: str) -> str:
+        return re.sub(r"[^A-Za-z0-9.-]+", "-", text).strip("-")
+
+    def _prefix(self, granule_id: str, channel: str) -> str:
+        return f"{self._slug(granule_id)}_{self._slug(channel)}_"
+
+    def _suffix(self, model_digest: str, settings: str) -> str:
+        return f"_{model_digest[:16]}_{settings}"
+
+    def _entry_stem(self, granule_id: str, channel: str, rows: Tuple[int, int],
+                    model_digest: str, settings: str) -> str:
+        """File stem of one (granule, channel, scan line window, model, settings) result"""
+        return f"{self._prefix(granule_id, channel)}{rows[0]}-{rows[1]}{self._suffix(model_digest, settings)}"
+
+    def load(self, granule_id: str, channel: str, rows: Tuple[int, int],
+             model_digest: str, settings: str) -> Optional[Tuple[np.ndarray, List[Dict]]]:
+        """
+        Load the cached result of exactly this scan line window
+
+        Only exact windows are served: the cascade normalizes over its input
+        strip and uses it as SR context, so a slice of a wider window is not
+        the result of a run on this one. Callers that accept a wider run,
+        like the polar path reusing full-strip results, load that window
+        and slice it themselves.
+
+        Args:
+            granule_id: Granule identifier (HDF5 file stem)
+            channel: Channel the temperatures were read from
+            rows: (start, stop) native scan lines of the input
+            model_digest: checkpoint_digest of the model
+            settings: settings_digest of the inference settings
+
+        Returns:
+            Tuple of (float32 result, stage statistics), or None on a miss.
+            float32 entries are copy-on-write memory maps.
+        """
+        path = self.cache_dir / f"{self._entry_stem(granule_id, channel, rows, model_digest, settings)}.npy"
+        if not path.exists():
+            return None
+
+        try:
+            with open(path.with_suffix(".json")) as f:
+                meta = json.load(f)
+            stored = np.load(path, mmap_mode="c")
+
+            if meta["dtype"] == "float16":
+                result = self._decode(stored, meta["offset"], meta["scale"])
+            else:
+                result = stored
+
+            if not meta.get("stats"):
+                raise ValueError("no stage statistics")
+
+            # Mark as recently used
+            os.utime(path)
+            logger.info(f"SR cache hit {path.name}")
+            return result, meta["stats"]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable SR cache entry {path.name}: {e}")
+            return None
+
+    def save(self, granule_id: str, channel: str, rows: Tuple[int, int], model_digest: str,
+             settings: str, result: np.ndarray, stats: List[Dict]):
+        """
+        Store a result and evict least recently used entries beyond the size limit
+
+        Args:
+            granule_id: Granule identifier (HDF5 file stem)
+            channel: Channel the temperatures were read from
+            rows: (start, stop) native scan lines of the input
+            model_digest: checkpoint_digest of the model
+            settings: settings_digest of the inference settings
+            result: 8x result, may be a memory map
+            stats: JSON-serializable stage statistics returned on hits
+        """
+        stem = self._entry_stem(granule_id, channel, rows, model_digest, settings)
+        path = self.cache_dir / f"{stem}.npy"
+        tmp_path = self.cache_dir / f"{stem}.tmp.npy"
+
+        meta = {"dtype": self.dtype, "offset": 0.0, "scale": 1.0, "stats": stats}
+        if self.dtype == "float16":
+            meta["offset"] = float(np.nanmin(result))
+            meta["scale"] = max(float(np.nanmax(result)) - meta["offset"], 1e-6)
+
+        try:
+            stored = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=self.dtype, shape=result.shape)
+            for r0 in range(0, result.shape[0], COPY_ROWS):
+                block = np.asarray(result[r0:r0 + COPY_ROWS], dtype=np.float32)
+                if self.dtype == "float16":
+                    block = (block - meta["offset"]) / meta["scale"]
+                stored[r0:r0 + COPY_ROWS] = block
+            stored.flush()
+            del stored
+
+            with open(path.with_suffix(".json"), "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write SR cache entry {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        evicted = evict_least_recently_used(self.cache_dir, self.max_bytes, "*.npy",
+                                            keep=path, sidecar_suffixes=(".json",))
+        if evicted:
+            logger.info(f"Evicted {evicted} SR cache entries")
+
+    def _decode(self, view: np.ndarray, offset: float, scale: float) -> np.ndarray:
+        """float32 temperatures of a normalized float16 entry, in a temporary memory map"""
+        from core.hole_filling import temporary_memmap
+
+        result = temporary_memmap(view.shape, dtype=np.float32)
+        for r0 in range(0, view.shape[0], COPY_ROWS):
+            result[r0:r0 + COPY_ROWS] = view[r0:r0 + COPY_ROWS].astype(np.float32) * scale + offset
+        return result
@@ -4,20 +4,28 @@ Handles both 8x single strip and 8x polar enhancements
 """
 
 import torch
+import torch.nn.functional as F
 import numpy as np
 import cv2
 import pathlib
 from pathlib import Path
-from typing import Dict, Tuple, List, Optional
+from typing import Dict, Iterable, Iterator, Tuple, List, Optional
 import logging
 from tqdm import tqdm
 import gc
-import pyproj
+import multiprocessing
 import sys
+import time
 
-from .temperature_sr_model import TemperatureSRModel
+from .temperature_sr_model import PRECISION_MODES, TemperatureSRModel
 from .data_preprocessing import TemperatureDataPreprocessor
+from .inference_backend import ExportedGenerator
+from .sr_cache import SRResultCache, checkpoint_digest, settings_digest
 from .config import load_config
+from .utils import calculate_psnr, calculate_ssim
+from core.grid_accumulator import TiledGridAccumulator
+from core.hole_filling import fill_holes_tiled, temporary_memmap
+from core.projection import get_ease2_transformer, hemisphere_scan_range, latlon_to_ease2
 
 logger = logging.getLogger(__name__)
 
@@ -25,13 +33,15 @@ logger = logging.getLogger(__name__)
 class TemperatureSRProcessor:
     """Temperature Super-Resolution Processor for 8x enhancement"""
 
-    def __init__(self, model_path: Path, device: str = None):
+    def __init__(self, model_path: Path, device: str = None, inference_opt: Optional[Dict] = None):
         """
         Initialize SR processor
 
         Args:
             model_path: Path to trained model checkpoint
             device: Device to run on ('cuda' or 'cpu')
+            inference_opt: Inference settings, the 'inference' section of
+                load_config() if None
         """
         if device is None:
             from utils.device_utils import get_best_device
@@ -42,6 +52,34 @@ class TemperatureSRProcessor:
         self.model = self._load_model(model_path)
         self.preprocessor = TemperatureDataPreprocessor()
 
+        # Batched inference settings
+        self.inference_opt = inference_opt or load_config()['inference']
+
+        # Exported float32 generator, eager mode if None
+        self.backend = None
+        if self.inference_opt['backend'] != 'eager':
+            self.backend = ExportedGenerator(self.model.net_g, model_path,
+                                             self.inference_opt['backend'], self.device)
+
+        # A reduced precision is only switched on once it passes the accuracy
+        # gate, on the first strip processed unless a reference is given
+        self._pending_precision = None
+        self.set_precision(self.inference_opt['precision'])
+
+        # Patches skipped by the flat patch gate and their audited error
+        self.reset_flat_gate_stats()
+
+        # Persistent 8x results, keyed by the checkpoint contents
+        self.model_path = Path(model_path)
+        self.result_cache = None
+        cache_opt = self.inference_opt['result_cache']
+        if cache_opt['enabled']:
+            from utils.file_manager import FileManager
+            self.result_cache = SRResultCache(
+                FileManager().get_cache_dir("sr_results"),
+                int(cache_opt['max_gb'] * 1024 ** 3), cache_opt['dtype']
+            )
+
     def _load_model(self, model_path: Path) -> TemperatureSRModel:
         """Load trained temperature SR model"""
         # Load configuration
@@ -68,6 +106,102 @@ class TemperatureSRProcessor:
         logger.info(f"Model loaded from {model_path}")
         return model
 
+    def set_precision(self, mode: str, reference_strip: Optional[np.ndarray] = None) -> Optional[Dict]:
+        """
+        Select the inference precision
+
+        float32 is applied immediately. A reduced precision is checked
+        against float32 (see check_precision) on reference_strip, or on the
+        next strip processed if no reference is given, and refused if it
+        exceeds the configured error thresholds.
+
+        Args:
+            mode: 'float32', 'bfloat16' or 'int8'
+            reference_strip: Temperature strip for the accuracy gate
+
+        Returns:
+            Accuracy gate result, or None if the gate did not run
+        """
+        if mode not in PRECISION_MODES:
+            raise ValueError(f"Unknown precision '{mode}', expected one of {PRECISION_MODES}")
+
+        if mode == 'float32':
+            self.model.set_precision(mode)
+            self._pending_precision = None
+            return None
+
+        self._pending_precision = mode
+        if reference_strip is None:
+            logger.info(f"{mode} inference pending the accuracy gate on the first strip")
+            return None
+
+        return self._apply_pending_precision(reference_strip)
+
+    def check_precision(self, mode: str, reference_strip: np.ndarray) -> Dict:
+        """
+        Compare one 2x stage in a reduced precision against float32
+
+        The first reference_rows scan lines of the strip are super-resolved
+        in both precisions. The temperature RMSE is measured in K; PSNR and
+        SSIM are measured on the normalized output scaled to [0, 255].
+
+        Args:
+            mode: Precision to check
+            reference_strip: Temperature strip in K
+
+        Returns:
+            Dictionary with rmse_k, psnr, ssim and whether the mode passed
+        """
+        gate = self.inference_opt['precision_gate']
+        reference = np.asarray(reference_strip[:gate['reference_rows']], dtype=np.float32)
+
+        temp_min, temp_max = float(np.min(reference)), float(np.max(reference))
+        if temp_max > temp_min:
+            normalized = (reference - temp_min) / (temp_max - temp_min)
+        else:
+            normalized = np.zeros_like(reference)
+
+        previous = self.model.precision
+        try:
+            self.model.set_precision('float32')
+            expected = self._sr_2x_normalized(normalized)
+            self.model.set_precision(mode)
+            actual = self._sr_2x_normalized(normalized)
+        finally:
+            self.model.set_precision(previous)
+
+        rmse_k = float(np.sqrt(np.mean((actual - expected) ** 2, dtype=np.float64))) * (temp_max - temp_min)
+        psnr = float(calculate_psnr(expected * 255, actual * 255, crop_border=0))
+        ssim = float(calculate_ssim(expected * 255, actual * 255, crop_border=0))
+
+        passed = rmse_k <= gate['max_rmse_k'] and psnr >= gate['min_psnr'] and ssim >= gate['min_ssim']
+
+        return {'mode': mode, 'rmse_k': rmse_k, 'psnr': psnr, 'ssim': ssim, 'passed': passed}
+
+    def _apply_pending_precision(self, reference_strip: np.ndarray) -> Optional[Dict]:
+        """Run the accuracy gate of a requested precision and switch to it if it passes"""
+        mode = self._pending_precision
+        if mode is None:
+            return None
+        self._pending_precision = None
+
+        try:
+            result = self.check_precision(mode, reference_strip)
+        except (ValueError, RuntimeError) as e:
+            logger.warning(f"{mode} inference unavailable, staying in float32: {e}")
+            return None
+
+        summary = (f"RMSE {result['rmse_k']:.3f} K, PSNR {result['psnr']:.1f} dB, "
+                   f"SSIM {result['ssim']:.4f}")
+        if result['passed']:
+            self.model.set_precision(mode)
+            logger.info(f"Using {mode} inference ({summary} vs float32)")
+        else:
+            self.model.set_precision('float32')
+            logger.warning(f"Refusing {mode} inference, accuracy gate failed ({summary} vs float32)")
+
+        return result
+
     def extract_coordinates_from_h5(self, h5_path: pathlib.Path) -> Tuple[np.ndarray, np.ndarray]:
         """
         Extract latitude and longitude coordinates from HDF5 file
@@ -104,20 +238,36 @@ class TemperatureSRProcessor:
     def process_single_strip_8x(self, temperature_data: np.ndarray,
                                 coordinates_lat: np.ndarray,
                                 coordinates_lon: np.ndarray,
-                                metadata: Dict) -> Dict:
+                                metadata: Dict,
+                                tile_rows: int = 256,
+                                out: Optional[np.ndarray] = None,
+                                granule_id: Optional[str] = None,
+                                channel: Optional[str] = None) -> Dict:
         """
         Process single strip with 8x enhancement
 
+        The three 2x stages are streamed tile by tile (see
+        _cascade_8x_streamed), so peak memory depends on tile_rows and not
+        on the strip length. With a granule_id, the result is read from and
+        stored in the SR result cache.
+
         Args:
             temperature_data: Temperature array
             coordinates_lat: Latitude coordinates
             coordinates_lon: Longitude coordinates
             metadata: Metadata dictionary
+            tile_rows: Input scan lines pushed through the cascade at once
+            out: float32 array of 8x the input shape for the result,
+                a temporary memmap if None
+            granule_id: Granule identifier (HDF5 file stem) for the result cache
+            channel: Channel of temperature_data, the DataHandler channel if None
 
         Returns:
             Dictionary with enhanced data and statistics
         """
         logger.info("Starting 8x enhancement for single strip")
+        self._apply_pending_precision(temperature_data)
+        self.reset_flat_gate_stats()
 
         # Store original stats
         orig_stats = {
@@ -127,27 +277,18 @@ class TemperatureSRProcessor:
             'shape': temperature_data.shape
         }
 
-        # Stage 1: First 2x enhancement
-        logger.info("Stage 1: First 2x enhancement")
-        sr_2x, stats_2x = self._enhance_2x(temperature_data)
-
-        # Stage 2: Second 2x enhancement (4x total)
-        logger.info("Stage 2: Second 2x enhancement (4x total)")
-        sr_4x, stats_4x = self._enhance_2x(sr_2x)
-
-        # Stage 3: Third 2x enhancement (8x total)
-        logger.info("Stage 3: Third 2x enhancement (8x total)")
-        sr_8x, stats_8x = self._enhance_2x(sr_4x)
+        # Stages 1-3: 2x -> 4x -> 8x, streamed tile by tile
+        logger.info("Stages 1-3: streamed 2x -> 4x -> 8x cascade")
+        sr_8x, bicubic_8x, (stats_2x, stats_4x, stats_8x) = self._cascade_8x_cached(
+            temperature_data, granule_id, channel, tile_rows=tile_rows, out=out
+        )
 
         # Upscale coordinates by 8x
         logger.info("Upscaling coordinates 8x")
         coords_lat_8x = self._upscale_coordinates(coordinates_lat, scale=8)
         coords_lon_8x = self._upscale_coordinates(coordinates_lon, scale=8)
 
-        # Create bicubic baseline for comparison
-        bicubic_8x = cv2.resize(temperature_data,
-                                (temperature_data.shape[1] * 8, temperature_data.shape[0] * 8),
-                                interpolation=cv2.INTER_CUBIC)
+        self._log_flat_gate()
 
         # Compile statistics
         final_stats = {
@@ -159,7 +300,8 @@ class TemperatureSRProcessor:
                 'min_preserved': stats_8x['min_temp'] / orig_stats['min_temp'],
                 'max_preserved': stats_8x['max_temp'] / orig_stats['max_temp'],
                 'avg_preserved': stats_8x['avg_temp'] / orig_stats['avg_temp']
-            }
+            },
+            'flat_gate': self.flat_gate_report()
         }
 
         logger.info(f"Enhancement complete: {orig_stats['shape']} → {sr_8x.shape}")
@@ -214,34 +356,8 @@ class TemperatureSRProcessor:
         else:
             normalized = np.zeros_like(temperature)
 
-        # Adapt patch size to ensure divisibility
-        patch_size = self.calculate_swinir_patch_size((h, w), patch_size)
-
-        # Process with patch-based approach
-        patches = self._extract_patches(normalized, patch_size, overlap_ratio)
-        sr_patches = []
-
-        with torch.no_grad():
-            for patch_info in tqdm(patches, desc="Processing patches", leave=False):
-                patch = patch_info['data']
-
-                # Convert to tensor - no padding needed as patch is already correct size
-                patch_tensor = torch.from_numpy(patch).float()
-                patch_tensor = patch_tensor.unsqueeze(0).unsqueeze(0).to(self.device)
-
-                # Super-resolution
-                sr_patch = self.model.net_g(patch_tensor)
-                sr_patch = torch.clamp(sr_patch, 0, 1)
-                sr_patch = sr_patch.squeeze().cpu().numpy()
-
-                sr_patches.append({
-                    'data': sr_patch,
-                    'position': patch_info['position'],
-                    'size': sr_patch.shape
-                })
-
-        # Reconstruct full image
-        sr_normalized = self._reconstruct_from_patches(sr_patches, (h * 2, w * 2))
+        sr_normalized = self._sr_2x_normalized(normalized, patch_size, overlap_ratio,
+                                               value_range=temp_max - temp_min)
 
         # Denormalize back to temperature
         sr_temperature = sr_normalized * (temp_max - temp_min) + temp_min
@@ -260,92 +376,488 @@ class TemperatureSRProcessor:
 
         return sr_temperature, stats_after
 
-    def _extract_patches(self, image: np.ndarray,
-                         patch_size: Tuple[int, int],
-                         overlap_ratio: float) -> List[Dict]:
-        """Extract overlapping patches from image"""
+    def _sr_2x_normalized(self, normalized: np.ndarray,
+                          patch_size: Tuple[int, int] = (1000, 110),
+                          overlap_ratio: float = 0.75,
+                          value_range: Optional[float] = None) -> np.ndarray:
+        """
+        2x super-resolution of a [0, 1] image with overlapping blended patches
+
+        The image is copied to the inference device once. Patches are
+        gathered there from an unfold view, and the blended result is
+        accumulated there. Only the finished 2x image comes back to the host.
+        value_range is the K span of [0, 1]; without it the flat patch gate
+        is off and every patch goes through the network. Images whose sides
+        are not multiples of the SwinIR window are reflect-padded, and the
+        output is cropped back to twice the input size.
+        """
+        h, w = normalized.shape
+
+        # SwinIR only takes multiples of its window size (check_image_size)
+        window_size = 8
+        pad_h, pad_w = -h % window_size, -w % window_size
+        if pad_h or pad_w:
+            padded = np.pad(normalized, ((0, pad_h), (0, pad_w)), mode='reflect')
+            sr = self._sr_2x_normalized(padded, patch_size, overlap_ratio, value_range)
+            return sr[:h * 2, :w * 2]
+
+        # Adapt patch size to ensure divisibility
+        patch_size = self.calculate_swinir_patch_size((h, w), patch_size)
+        patch_shape = (min(patch_size[0], h), min(patch_size[1], w))
+
+        # Process with patch-based approach
+        blend = self.inference_opt['blend']
+        halo = self.inference_opt['patch_halo']
+
+        if blend == "halo":
+            positions = self._plan_patch_positions((h, w), patch_shape, halo)
+        else:
+            positions = self._extract_patch_positions((h, w), patch_shape, overlap_ratio)
+
+        image = torch.from_numpy(np.ascontiguousarray(normalized, dtype=np.float32)).to(self.device)
+        window = self._blend_window((patch_shape[0] * 2, patch_shape[1] * 2), blend, 4 * halo)
+
+        output, weight = self._infer_and_blend(image, positions, patch_shape, window, value_range)
+
+        # Normalize by weights
+        output = torch.where(weight > 0, output / weight, torch.zeros_like(output))
+        return output.cpu().numpy()
+
+    def _cascade_8x_streamed(self, temperature: np.ndarray, tile_rows: int = 256,
+                             halo: int = 16, patch_size: Tuple[int, int] = (1000, 110),
+                             overlap_ratio: float = 0.75,
+                             out: Optional[np.ndarray] = None,
+                             with_bicubic: bool = True) -> Tuple[np.ndarray, Optional[np.ndarray], List[Dict]]:
+        """
+        Run the 2x -> 4x -> 8x cascade tile by tile
+
+        Each block of tile_rows input scan lines is read with halo extra
+        lines on both sides and pushed through all three 2x stages. Only the
+        core of the final 8x block is written out, so no full-size 2x or 4x
+        intermediate is ever held. All stages work in the [0, 1] range of
+        the input strip, which replaces the per-stage renormalization.
+
+        Args:
+            temperature: Input temperature strip
+            tile_rows: Input scan lines per tile
+            halo: Extra input scan lines on each side of a tile
+            patch_size: Target patch size of each 2x stage
+            overlap_ratio: Patch overlap of each 2x stage (gaussian blend)
+            out: float32 output of 8x the input shape, a temporary memmap if None
+            with_bicubic: Also produce the bicubic baseline
+
+        Returns:
+            Tuple of (8x temperature, 8x bicubic baseline or None, statistics
+            of the 2x, 4x and 8x stages)
+        """
+        h, w = temperature.shape
+        scale = 8
+
+        temp_min = float(np.min(temperature))
+        temp_max = float(np.max(temperature))
+        temp_range = temp_max - temp_min
+
+        if temp_max > temp_min:
+            normalized = ((temperature - temp_min) / temp_range).astype(np.float32)
+        else:
+            normalized = np.zeros(temperature.shape, dtype=np.float32)
+
+        if out is None:
+            out = temporary_memmap((h * scale, w * scale), dtype=np.float32)
+
+        # Running min / max / sum / count of the normalized output of each stage
+        running = [[np.inf, -np.inf, 0.0, 0] for _ in range(3)]
+
+        for r0 in tqdm(range(0, h, tile_rows), desc="Cascade tiles", leave=False):
+            r1 = min(h, r0 + tile_rows)
+            a0, a1 = max(0, r0 - halo), min(h, r1 + halo)
+
+            block = normalized[a0:a1]
+            for stage in range(3):
+                block = self._sr_2x_normalized(block, patch_size, overlap_ratio, value_range=temp_range)
+
+                factor = 2 ** (stage + 1)
+                core_block = block[(r0 - a0) * factor:(r1 - a0) * factor]
+                stats = running[stage]
+                stats[0] = min(stats[0], float(core_block.min()))
+                stats[1] = max(stats[1], float(core_block.max()))
+                stats[2] += float(core_block.sum(dtype=np.float64))
+                stats[3] += core_block.size
+
+            out[r0 * scale:r1 * scale] = core_block * temp_range + temp_min
+
+            gc.collect()
+
+        stage_stats = [
+            {
+                'min_temp': stats[0] * temp_range + temp_min,
+                'max_temp': stats[1] * temp_range + temp_min,
+                'avg_temp': stats[2] / stats[3] * temp_range + temp_min,
+                'shape': (h * 2 ** (stage + 1), w * 2 ** (stage + 1))
+            }
+            for stage, stats in enumerate(running)
+        ]
+
+        torch.cuda.empty_cache()
+
+        bicubic_out = self._bicubic_8x(temperature, tile_rows, halo) if with_bicubic else None
+        return out, bicubic_out, stage_stats
+
+    def _cascade_8x_cached(self, temperature: np.ndarray, granule_id: Optional[str] = None,
+                           channel: Optional[str] = None, rows: Optional[Tuple[int, int]] = None,
+                           tile_rows: int = 256, out: Optional[np.ndarray] = None,
+                           with_bicubic: bool = True,
+                           total_rows: Optional[int] = None) -> Tuple[np.ndarray, Optional[np.ndarray], List[Dict]]:
+        """
+        _cascade_8x_streamed through the persistent SR result cache
+
+        Results are keyed by granule, channel, native scan line window,
+        checkpoint digest and the settings that change the output. Without
+        a granule_id or with the cache disabled the cascade always runs.
+
+        With total_rows, a window that is a crop of the granule is first
+        served from the full-strip entry (0, total_rows) stored by an 8x
+        strip run, sliced to the window; that result was normalized over
+        and has the SR context of the whole strip. Otherwise the exact
+        window is looked up, and a miss runs and stores the window alone.
+
+        Args:
+            temperature: Input temperature strip, the rows window of the granule
+            granule_id: Granule identifier (HDF5 file stem)
+            channel: Channel of the temperatures, the DataHandler channel if None
+            rows: (start, stop) scan lines of the granule in temperature, all if None
+            tile_rows: Input scan lines per cascade tile
+            out: float32 output of 8x the input shape, a temporary memmap if None
+            with_bicubic: Also produce the bicubic baseline
+            total_rows: Scan lines of the whole granule, to reuse full-strip
+                entries for a cropped window
+
+        Returns:
+            Same as _cascade_8x_streamed; cached results come with the stage
+            statistics of the run that stored them
+        """
+        if self.result_cache is None or granule_id is None:
+            return self._cascade_8x_streamed(temperature, tile_rows=tile_rows, out=out,
+                                             with_bicubic=with_bicubic)
+
+        if channel is None:
+            from core.data_handler import DataHandler
+            channel = DataHandler().var_name
+        if rows is None:
+            rows = (0, temperature.shape[0])
+
+        scale = 8
+        model_digest = checkpoint_digest(self.model_path)
+        settings = settings_digest({
+            'precision': self.model.precision,
+            'blend': self.inference_opt['blend'],
+            'patch_halo': self.inference_opt['patch_halo'],
+            'tile_rows': tile_rows,
+            'scale': scale,
+            'flat_gate': self.inference_opt['flat_gate'] if self.inference_opt['flat_gate']['enabled'] else None
+        })
+
+        cached = None
+        full_rows = (0, total_rows) if total_rows is not None else rows
+        if full_rows != rows:
+            cached = self.result_cache.load(granule_id, channel, full_rows, model_digest, settings)
+            if cached is not None:
+                full_8x, full_stats = cached
+                cached = full_8x[rows[0] * scale:rows[1] * scale], full_stats
+        if cached is None:
+            cached = self.result_cache.load(granule_id, channel, rows, model_digest, settings)
+        if cached is None:
+            sr_8x, bicubic_8x, stage_stats = self._cascade_8x_streamed(
+                temperature, tile_rows=tile_rows, out=out, with_bicubic=with_bicubic
+            )
+            self.result_cache.save(granule_id, channel, rows, model_digest, settings, sr_8x,
+                                   [{**stats, 'shape': list(stats['shape'])} for stats in stage_stats])
+            return sr_8x, bicubic_8x, stage_stats
+
+        sr_8x, stage_stats = cached
+        if out is not None:
+            out[:] = sr_8x
+            sr_8x = out
+        stage_stats = [{**stats, 'shape': tuple(stats['shape'])} for stats in stage_stats]
+
+        bicubic_8x = self._bicubic_8x(temperature, tile_rows) if with_bicubic else None
+        return sr_8x, bicubic_8x, stage_stats
+
+    def _bicubic_8x(self, temperature: np.ndarray, tile_rows: int = 256, halo: int = 16) -> np.ndarray:
+        """8x bicubic baseline, tile by tile into a temporary memmap"""
+        h, w = temperature.shape
+        scale = 8
+        bicubic_out = temporary_memmap((h * scale, w * scale), dtype=np.float32)
+
+        for r0 in range(0, h, tile_rows):
+            r1 = min(h, r0 + tile_rows)
+            a0, a1 = max(0, r0 - halo), min(h, r1 + halo)
+
+            # The halo covers the 4-tap support
+            bicubic = cv2.resize(temperature[a0:a1], (w * scale, (a1 - a0) * scale),
+                                 interpolation=cv2.INTER_CUBIC)
+            bicubic_out[r0 * scale:r1 * scale] = bicubic[(r0 - a0) * scale:(r1 - a0) * scale]
+
+        return bicubic_out
+
+    def _estimate_patch_bytes(self, patch_shape: Tuple[int, int]) -> int:
+        """
+        Rough peak activation memory of one patch in a SwinIR forward pass
+
+        Counts the attention scores of one block (all windows and heads) and
+        a few live MLP-sized feature maps, in float32.
+        """
+        opt_net = load_config()['network_g']
+        tokens = patch_shape[0] * patch_shape[1]
+
+        attention = tokens * opt_net['window_size'] ** 2 * max(opt_net['num_heads'])
+        features = 3 * tokens * opt_net['embed_dim'] * opt_net['mlp_ratio']
+
+        return 4 * (attention + features)
+
+    def _inference_batch_size(self, patch_shape: Tuple[int, int]) -> int:
+        """Number of same-shaped patches that fit the inference memory budget"""
+        budget = self.inference_opt['batch_memory_mb'] * 1024 ** 2
+
+        if self.device.type == 'cuda':
+            free_bytes, _ = torch.cuda.mem_get_info(self.device)
+            budget = min(budget, int(free_bytes * 0.8))
+
+        batch_size = budget // self._estimate_patch_bytes(patch_shape)
+        return int(max(1, min(batch_size, self.inference_opt['max_batch_size'])))
+
+    def _infer_and_blend(self, image: torch.Tensor, positions: List[Tuple[int, int]],
+                         patch_shape: Tuple[int, int], window: torch.Tensor,
+                         value_range: Optional[float] = None) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Run the network on patches in batches and blend the results on the device
+
+        Patches are gathered from an unfold view of the image, stacked into
+        batches sized by the memory budget, and their weighted 2x outputs are
+        added into output / weight accumulators at twice their input position.
+
+        Args:
+            image: Normalized 2D image on the inference device
+            positions: Top-left (y, x) input position of each patch
+            patch_shape: Input patch size
+            window: 2x blend weights shared by every patch
+            value_range: K span of the normalized range, enables the flat patch gate
+
+        Returns:
+            Tuple of (weighted sum, weight sum) tensors of twice the image size
+        """
         h, w = image.shape
-        patch_h, patch_w = patch_size
+        patch_h, patch_w = patch_shape
+        out_h, out_w = patch_h * 2, patch_w * 2
 
-        # Ensure patch size doesn't exceed image size
-        patch_h = min(patch_h, h)
-        patch_w = min(patch_w, w)
+        output = torch.zeros((h * 2, w * 2), dtype=torch.float32, device=image.device)
+        weight = torch.zeros_like(output)
+
+        # All patch windows as a view, shape (h - patch_h + 1, w - patch_w + 1, patch_h, patch_w)
+        patch_view = image.unfold(0, patch_h, 1).unfold(1, patch_w, 1)
+
+        batch_size = self._inference_batch_size(patch_shape)
+        logger.debug(f"Batching {len(positions)} patches of {patch_shape} in batches of {batch_size}")
+
+        start_time = time.perf_counter()
+
+        with torch.no_grad():
+            for start in tqdm(range(0, len(positions), batch_size), desc="Processing patches", leave=False):
+                batch_positions = positions[start:start + batch_size]
+                ys = torch.tensor([y for y, _ in batch_positions], device=image.device)
+                xs = torch.tensor([x for _, x in batch_positions], device=image.device)
+
+                # B x 1 x H x W - no padding needed as patches are already correct size
+                batch = patch_view[ys, xs].unsqueeze(1)
+
+                # Super-resolution
+                sr_batch = torch.clamp(self._gated_generator(batch, value_range), 0, 1)[:, 0] * window
+
+                for (y, x), sr_patch in zip(batch_positions, sr_batch):
+                    output[2 * y:2 * y + out_h, 2 * x:2 * x + out_w] += sr_patch
+                    weight[2 * y:2 * y + out_h, 2 * x:2 * x + out_w] += window
+
+        elapsed = time.perf_counter() - start_time
+        if positions:
+            logger.info(f"Inference: {len(positions)} patches in {elapsed:.1f}s "
+                        f"({len(positions) / max(elapsed, 1e-9):.2f} patches/s)")
+
+        return output, weight
+
+    def _flat_patch_mask(self, batch: torch.Tensor, value_range: float) -> torch.Tensor:
+        """Patches whose spread in K is below the flat gate threshold"""
+        gate = self.inference_opt['flat_gate']
+
+        if gate['metric'] == "gradient":
+            dy = batch[..., 1:, :] - batch[..., :-1, :]
+            dx = batch[..., :, 1:] - batch[..., :, :-1]
+            energy = (dy.pow(2).mean(dim=(1, 2, 3)) + dx.pow(2).mean(dim=(1, 2, 3))) / 2
+            spread = energy.sqrt()
+        else:
+            spread = batch.std(dim=(1, 2, 3))
+
+        return spread * value_range < gate['threshold_k']
+
+    def _gated_generator(self, batch: torch.Tensor, value_range: Optional[float]) -> torch.Tensor:
+        """
+        Generator forward pass that upsamples flat patches bicubically
+
+        Every audit_every-th skipped patch is also run through the network,
+        and the difference is recorded in flat_gate_stats as a sampled
+        error bound of skipping.
+        """
+        gate = self.inference_opt['flat_gate']
+        if not gate['enabled'] or value_range is None:
+            return self._run_generator(batch)
+
+        stats = self.flat_gate_stats
+        flat = self._flat_patch_mask(batch, value_range)
+        stats['patches'] += batch.shape[0]
+
+        if not bool(flat.any()):
+            return self._run_generator(batch)
+
+        sr_batch = F.interpolate(batch, scale_factor=2, mode='bicubic', align_corners=False)
+        if not bool(flat.all()):
+            sr_batch[~flat] = self._run_generator(batch[~flat]).to(sr_batch.dtype)
+
+        # Audit a sample of the skipped patches against the network
+        flat_indices = torch.nonzero(flat).flatten().tolist()
+        audit = [i for n, i in enumerate(flat_indices, start=stats['skipped'])
+                 if n % gate['audit_every'] == 0]
+        stats['skipped'] += len(flat_indices)
+
+        if audit:
+            expected = torch.clamp(self._run_generator(batch[audit]), 0, 1)
+            error = (torch.clamp(sr_batch[audit], 0, 1) - expected) * value_range
+            stats['audited'] += len(audit)
+            stats['max_error_k'] = max(stats['max_error_k'], float(error.abs().max()))
+            stats['sum_sq_error_k'] += float(error.pow(2).sum())
+            stats['audited_pixels'] += error.numel()
+
+        return sr_batch
+
+    def reset_flat_gate_stats(self):
+        """Start counting skipped patches and their audited error anew"""
+        self.flat_gate_stats = {'patches': 0, 'skipped': 0, 'audited': 0, 'max_error_k': 0.0,
+                                'sum_sq_error_k': 0.0, 'audited_pixels': 0}
+
+    def flat_gate_report(self) -> Dict:
+        """
+        Flat patch gate results since the last reset
+
+        Returns:
+            Dictionary with the patch and skipped patch counts, and the
+            maximum and RMS error in K of the audited skipped patches
+            against full inference
+        """
+        stats = self.flat_gate_stats
+        rms = np.sqrt(stats['sum_sq_error_k'] / stats['audited_pixels']) if stats['audited_pixels'] else 0.0
+        return {
+            'patches': stats['patches'],
+            'skipped': stats['skipped'],
+            'audited': stats['audited'],
+            'max_error_k': stats['max_error_k'],
+            'rms_error_k': float(rms)
+        }
+
+    def _log_flat_gate(self, report: Optional[Dict] = None):
+        """Log the flat patch gate results if it skipped anything, this processor's if report is None"""
+        report = report or self.flat_gate_report()
+        if report['skipped']:
+            logger.info(f"Flat patch gate: {report['skipped']}/{report['patches']} patches bicubic, "
+                        f"audited {report['audited']}: max error {report['max_error_k']:.3f} K, "
+                        f"RMS {report['rms_error_k']:.3f} K")
+
+    def _run_generator(self, batch: torch.Tensor) -> torch.Tensor:
+        """
+        Generator forward pass, through the exported backend where possible
+
+        Exports are made per batch shape: a stage needs one for its full
+        batches and at most one for the short last batch. Reduced
+        precisions always run in eager mode.
+        """
+        if self.backend is None or self.model.precision != 'float32':
+            return self.model.infer(batch)
+        return self.backend(batch).to(self.device)
+
+    def _extract_patch_positions(self, image_shape: Tuple[int, int],
+                                 patch_shape: Tuple[int, int],
+                                 overlap_ratio: float) -> List[Tuple[int, int]]:
+        """Positions of overlapping patches (legacy fixed-overlap tiling)"""
+        h, w = image_shape
+        patch_h, patch_w = patch_shape
 
         # Calculate stride
-        stride_h = int(patch_h * (1 - overlap_ratio))
-        stride_w = int(patch_w * (1 - overlap_ratio))
-
-        patches = []
-
-        for y in range(0, h - patch_h + 1, stride_h):
-            for x in range(0, w - patch_w + 1, stride_w):
-                # Ensure we don't go out of bounds
-                if y + patch_h > h:
-                    y = h - patch_h
-                if x + patch_w > w:
-                    x = w - patch_w
-
-                patch = image[y:y + patch_h, x:x + patch_w]
-                patches.append({
-                    'data': patch,
-                    'position': (y, x),
-                    'size': (patch_h, patch_w)
-                })
-
-        # Add edge patches if needed
-        if (h - 1) % stride_h != 0:
-            y = h - patch_h
-            for x in range(0, w - patch_w + 1, stride_w):
-                if x + patch_w > w:
-                    x = w - patch_w
-                patch = image[y:y + patch_h, x:x + patch_w]
-                patches.append({
-                    'data': patch,
-                    'position': (y, x),
-                    'size': (patch_h, patch_w)
-                })
-
-        if (w - 1) % stride_w != 0:
-            x = w - patch_w
-            for y in range(0, h - patch_h + 1, stride_h):
-                if y + patch_h > h:
-                    y = h - patch_h
-                patch = image[y:y + patch_h, x:x + patch_w]
-                patches.append({
-                    'data': patch,
-                    'position': (y, x),
-                    'size': (patch_h, patch_w)
-                })
-
-        return patches
-
-    def _reconstruct_from_patches(self, patches: List[Dict],
-                                  output_shape: Tuple[int, int]) -> np.ndarray:
-        """Reconstruct full image from patches with blending"""
-        h, w = output_shape
-        output = np.zeros((h, w), dtype=np.float64)
-        weight = np.zeros((h, w), dtype=np.float64)
-
-        for patch_info in patches:
-            patch = patch_info['data']
-            y, x = patch_info['position']
-            y *= 2  # Scale position for 2x output
-            x *= 2
-
-            patch_h, patch_w = patch.shape
-
-            # Create Gaussian weight for smooth blending
-            weight_patch = self._create_gaussian_weight(patch.shape)
-
-            # Add to output with weights
-            output[y:y + patch_h, x:x + patch_w] += patch * weight_patch
-            weight[y:y + patch_h, x:x + patch_w] += weight_patch
+        stride_h = max(1, int(patch_h * (1 - overlap_ratio)))
+        stride_w = max(1, int(patch_w * (1 - overlap_ratio)))
 
-        # Normalize by weights
-        mask = weight > 0
-        output[mask] = output[mask] / weight[mask]
+        # Regular grid plus the last row / column flush with the image edges
+        ys = list(range(0, h - patch_h + 1, stride_h))
+        xs = list(range(0, w - patch_w + 1, stride_w))
+        if ys[-1] != h - patch_h:
+            ys.append(h - patch_h)
+        if xs[-1] != w - patch_w:
+            xs.append(w - patch_w)
 
-        return output
+        return [(y, x) for y in ys for x in xs]
+
+    def _plan_patch_axis(self, length: int, patch: int, halo: int) -> List[int]:
+        """
+        Fewest patch start positions covering one axis
+
+        Neighbouring patches overlap by at least 2 * halo, so every pixel
+        is at least halo pixels from the edge of some patch, except at the
+        image border.
+        """
+        if length <= patch:
+            return [0]
+
+        # Keep a non-empty core
+        halo = min(halo, (patch - 1) // 2)
+        count = int(np.ceil((length - 2 * halo) / (patch - 2 * halo)))
+        positions = np.round(np.linspace(0, length - patch, max(count, 2))).astype(int)
+
+        return sorted(set(positions.tolist()))
+
+    def _plan_patch_positions(self, image_shape: Tuple[int, int], patch_shape: Tuple[int, int],
+                              halo: int) -> List[Tuple[int, int]]:
+        """
+        Cover an image with the fewest patches that overlap by 2 * halo
+
+        Args:
+            image_shape: Image size
+            patch_shape: Patch size, no larger than the image
+            halo: Context in pixels each patch carries around its core
+
+        Returns:
+            Top-left (y, x) position of each patch, no duplicates
+        """
+        ys = self._plan_patch_axis(image_shape[0], patch_shape[0], halo)
+        xs = self._plan_patch_axis(image_shape[1], patch_shape[1], halo)
+        return [(y, x) for y in ys for x in xs]
+
+    def _blend_window(self, shape: Tuple[int, int], blend: str, feather: int) -> torch.Tensor:
+        """
+        Blend weights for 2x patches of one shape, built once and kept on the device
+
+        'gaussian' weights whole patches. 'halo' is 1 in the core with linear
+        ramps over the feather-wide borders that neighbours overlap. Every
+        patch uses the same window; at the image border the ramp is shared
+        by all patches covering a pixel, so it cancels in the normalization.
+        """
+        if not hasattr(self, '_blend_windows'):
+            self._blend_windows = {}
+
+        key = (shape, blend, feather, str(self.device))
+        if key not in self._blend_windows:
+            if blend == "halo":
+                window = self._create_halo_weight(shape, feather)
+            else:
+                window = self._create_gaussian_weight(shape)
+            self._blend_windows[key] = torch.from_numpy(window).to(self.device)
+
+        return self._blend_windows[key]
 
     def _create_gaussian_weight(self, shape: Tuple[int, int], sigma_ratio: float = 0.3) -> np.ndarray:
         """Create 2D Gaussian weight map for smooth blending"""
@@ -367,6 +879,23 @@ class TemperatureSRProcessor:
 
         return gaussian.astype(np.float32)
 
+    def _create_halo_weight(self, shape: Tuple[int, int], feather: int) -> np.ndarray:
+        """Weight map that is 1 except for linear ramps over feather pixels at each border"""
+        windows = []
+
+        for size in shape:
+            window = np.ones(size, dtype=np.float32)
+            width = min(feather, size // 2)
+
+            if width > 0:
+                ramp = ((np.arange(width) + 0.5) / width).astype(np.float32)
+                window[:width] = ramp
+                window[-width:] = ramp[::-1]
+
+            windows.append(window)
+
+        return np.outer(windows[0], windows[1])
+
     def _upscale_coordinates(self, coords: np.ndarray, scale: int = 8) -> np.ndarray:
         """
         Upscale coordinate array by given scale factor
@@ -396,64 +925,334 @@ class TemperatureSRProcessor:
 
         return upscaled
 
-    def process_polar_8x_enhanced(self, h5_files: List[Path],
-                                  orbit_type: str,
-                                  pole: str = "N") -> Dict:
+    def _load_granule(self, h5_file: Path, data_handler, pole: Optional[str] = None,
+                      crop_halo: int = 16) -> Optional[Dict]:
         """
-        Process multiple files for 8x enhanced polar image
+        Read one granule's temperatures and coordinates, cropped to a pole's grid
+
+        Args:
+            h5_file: HDF5 file path
+            data_handler: DataHandler reading the temperatures
+            pole: 'N' or 'S' to crop to that hemisphere, None to keep the whole strip
+            crop_halo: Extra native scan lines kept on each side of the crop
+
+        Returns:
+            Dictionary with temperature, lat, lon, scale_factor, the
+            (start, stop) scan lines kept and the granule's total_rows, or
+            None if there is nothing to enhance
+        """
+        # Extract temperature data
+        temp_data, scale_factor = data_handler.extract_temperature_data(h5_file)
+
+        if temp_data is None:
+            logger.warning(f"Failed to extract data from {h5_file.name}")
+            return None
+
+        # Extract coordinates
+        lat, lon = self.extract_coordinates_from_h5(h5_file)
+
+        # Only enhance the scan lines that can land on the pole's grid
+        total_rows = temp_data.shape[0]
+        row_start, row_stop = 0, total_rows
+        if pole is not None:
+            scan_range = hemisphere_scan_range(lat, pole, halo=crop_halo)
+            if scan_range is None:
+                logger.info(f"Skipping {h5_file.name}, no scan line reaches the {pole} grid")
+                return None
+
+            row_start, row_stop = scan_range
+            temp_data = temp_data[row_start:row_stop]
+            lat = lat[row_start:row_stop]
+            lon = lon[row_start:row_stop]
+            logger.info(f"Cropped to scan lines {row_start}-{row_stop} of {total_rows}")
+
+        return {'temperature': temp_data, 'lat': lat, 'lon': lon,
+                'scale_factor': scale_factor, 'rows': (row_start, row_stop), 'total_rows': total_rows}
+
+    def _iter_enhanced_swaths(self, h5_files: List[Path], orbit_type: str,
+                              pole: Optional[str] = None, crop_halo: int = 16) -> Iterator[Dict]:
+        """
+        Enhance granules one at a time
+
+        Each swath is yielded as soon as it is enhanced and dropped before
+        the next granule is read, so at most one 8x swath is alive. With a
+        pole, each strip is first cropped to the scan lines that can reach
+        that pole's grid, plus crop_halo lines of SR context on each side.
+        Granules that fail to read or enhance are logged and skipped.
 
         Args:
             h5_files: List of HDF5 file paths
             orbit_type: 'A' or 'D'
-            pole: 'N' or 'S'
+            pole: 'N' or 'S' to crop to that hemisphere, None to keep whole strips
+            crop_halo: Extra native scan lines kept on each side of the crop
 
-        Returns:
-            Dictionary with enhanced polar data
+        Yields:
+            Dictionary with 8x temperature, native lat / lon and metadata
         """
         from core.data_handler import DataHandler
-        from core.image_processor import ImageProcessor
 
         data_handler = DataHandler()
-        enhanced_swaths = []
-
-        logger.info(f"Processing {len(h5_files)} files for 8x enhanced polar image")
 
-        # Process each file individually
         for idx, h5_file in enumerate(h5_files):
             logger.info(f"Processing file {idx + 1}/{len(h5_files)}: {h5_file.name}")
 
-            # Extract temperature data
-            temp_data, scale_factor = data_handler.extract_temperature_data(h5_file)
-
-            if temp_data is None:
-                logger.warning(f"Failed to extract data from {h5_file.name}")
+            # A granule that cannot be read or enhanced is skipped, not the whole run
+            try:
+                granule = self._load_granule(h5_file, data_handler, pole, crop_halo)
+                if granule is None:
+                    continue
+                temp_data = granule.pop('temperature')
+
+                # Enhance temperature to 8x, no bicubic baseline needed for gridding
+                self._apply_pending_precision(temp_data)
+                self.reset_flat_gate_stats()
+                temperature_8x, _, _ = self._cascade_8x_cached(
+                    temp_data, h5_file.stem, data_handler.var_name, granule['rows'], with_bicubic=False,
+                    total_rows=granule['total_rows']
+                )
+            except Exception as e:
+                logger.warning(f"Error processing {h5_file.name}: {e}")
                 continue
+            self._log_flat_gate()
 
-            # Extract coordinates
-            lat, lon = self.extract_coordinates_from_h5(h5_file)
-
-            # Enhance temperature to 8x
-            enhanced_result = self.process_single_strip_8x(
-                temp_data, lat, lon,
-                {'orbit_type': orbit_type, 'scale_factor': scale_factor}
-            )
+            swath = self._enhanced_swath(h5_file, granule, temperature_8x, orbit_type)
+            del temp_data, granule, temperature_8x
 
-            enhanced_swaths.append({
-                'temperature': enhanced_result['temperature_8x'],
-                'lat': enhanced_result['coordinates_lat_8x'],
-                'lon': enhanced_result['coordinates_lon_8x'],
-                'metadata': enhanced_result['metadata']
-            })
+            yield swath
 
             # Clear memory
+            del swath
             gc.collect()
             torch.cuda.empty_cache()
 
+    def _enhanced_swath(self, h5_file: Path, granule: Dict, temperature_8x: np.ndarray,
+                        orbit_type: str) -> Dict:
+        """Swath dictionary of an enhanced granule, as consumed by EnhancedPolarProcessor"""
+        return {
+            'temperature': temperature_8x,
+            'lat': granule['lat'],
+            'lon': granule['lon'],
+            'metadata': {'filename': h5_file.name, 'orbit_type': orbit_type,
+                         'scale_factor': granule['scale_factor'], 'enhancement': '8x',
+                         'row_range': granule['rows']}
+        }
+
+    def _iter_enhanced_swaths_parallel(self, h5_files: List[Path], orbit_type: str,
+                                       pole: Optional[str] = None, crop_halo: int = 16,
+                                       workers: int = 2,
+                                       threads_per_worker: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Enhance granules in worker processes, each with its own model replica
+
+        Inputs and 8x outputs are handed over in shared memory, not pickled.
+        Granules are read up to 2 * workers files ahead of the one being
+        yielded, and whenever a worker is free the largest cropped strip of
+        those is submitted, so long granules do not start last. Swaths are
+        yielded in file order, like the serial path, so the accumulated grid
+        does not depend on the number of workers; at most 2 * workers
+        finished swaths wait for their turn.
+
+        Args:
+            h5_files: List of HDF5 file paths
+            orbit_type: 'A' or 'D'
+            pole: 'N' or 'S' to crop to that hemisphere, None to keep whole strips
+            crop_halo: Extra native scan lines kept on each side of the crop
+            workers: Worker processes, one model replica each
+            threads_per_worker: Torch intra-op threads per worker, the CPU
+                count divided by workers if None
+
+        Yields:
+            Dictionary with 8x temperature, native lat / lon and metadata
+        """
+        import os
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        from multiprocessing import shared_memory
+        from core.data_handler import DataHandler
+
+        data_handler = DataHandler()
+        threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        lookahead = 2 * workers
+
+        # Replicas use this processor's settings; reduced precisions are gated again by each
+        worker_opt = {**self.inference_opt, 'precision': self._pending_precision or self.model.precision}
+        logger.info(f"Enhancing {len(h5_files)} granules in {workers} worker processes "
+                    f"with {threads_per_worker} threads each")
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_sr_worker,
+            initargs=(self.model_path, threads_per_worker, worker_opt)
+        )
+
+        # File index -> granule read but not submitted
+        loaded = {}
+        # Future -> (file index, granule without temperature, input and output segments, output shape)
+        running = {}
+        # File index -> enhanced swath waiting for its turn, None if the granule was skipped
+        finished = {}
+        next_read = 0
+        next_yield = 0
+
+        def release(*segments):
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+        def submit(index, granule):
+            temp_data = np.ascontiguousarray(granule.pop('temperature'))
+            out_shape = (temp_data.shape[0] * 8, temp_data.shape[1] * 8)
+
+            segments = []
+            try:
+                segments.append(shared_memory.SharedMemory(create=True, size=max(temp_data.nbytes, 1)))
+                segments.append(shared_memory.SharedMemory(
+                    create=True, size=max(out_shape[0] * out_shape[1] * 4, 1)
+                ))
+                shm_in, shm_out = segments
+                np.ndarray(temp_data.shape, temp_data.dtype, buffer=shm_in.buf)[:] = temp_data
+
+                future = executor.submit(
+                    _enhance_shared_granule, shm_in.name, temp_data.shape, temp_data.dtype.str,
+                    shm_out.name, h5_files[index].stem, data_handler.var_name, granule['rows'],
+                    granule['total_rows']
+                )
+            except Exception:
+                release(*segments)
+                raise
+            running[future] = (index, granule, shm_in, shm_out, out_shape)
+
+        def fill():
+            nonlocal next_read
+            while next_read < min(len(h5_files), next_yield + lookahead):
+                h5_file = h5_files[next_read]
+                try:
+                    granule = self._load_granule(h5_file, data_handler, pole, crop_halo)
+                except Exception as e:
+                    logger.warning(f"Error processing {h5_file.name}: {e}")
+                    granule = None
+
+                if granule is None:
+                    finished[next_read] = None
+                else:
+                    loaded[next_read] = granule
+                next_read += 1
+
+            # Balance the pool by granule size, largest first
+            while loaded and len(running) < workers:
+                index = max(loaded, key=lambda i: loaded[i]['temperature'].size)
+                submit(index, loaded.pop(index))
+
+        def collect(future) -> Optional[Dict]:
+            index, granule, shm_in, shm_out, out_shape = running.pop(future)
+            h5_file = h5_files[index]
+            release(shm_in)
+
+            try:
+                report = future.result()
+            except Exception as e:
+                logger.warning(f"Error processing {h5_file.name}: {e}")
+                release(shm_out)
+                return None
+
+            # Copy out so the segment is freed however long the swath waits or is kept
+            temperature_8x = temporary_memmap(out_shape, dtype=np.float32)
+            shared = np.ndarray(out_shape, np.float32, buffer=shm_out.buf)
+            for r0 in range(0, out_shape[0], 2048):
+                temperature_8x[r0:r0 + 2048] = shared[r0:r0 + 2048]
+            del shared
+            release(shm_out)
+
+            logger.info(f"Enhanced {h5_file.name}")
+            self._log_flat_gate(report)
+            return self._enhanced_swath(h5_file, granule, temperature_8x, orbit_type)
+
+        with executor:
+            try:
+                fill()
+                while next_yield < len(h5_files):
+                    if next_yield not in finished:
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            index = running[future][0]
+                            finished[index] = collect(future)
+                        fill()
+                        continue
+
+                    swath = finished.pop(next_yield)
+                    next_yield += 1
+
+                    # Keep the workers busy while this granule is gridded
+                    fill()
+                    if swath is None:
+                        continue
+
+                    yield swath
+
+                    del swath
+                    gc.collect()
+            finally:
+                for future, (_, _, shm_in, shm_out, _) in running.items():
+                    future.cancel()
+                    release(shm_in, shm_out)
+                running.clear()
+                finished.clear()
+
+    def process_polar_8x_enhanced(self, h5_files: List[Path],
+                                  orbit_type: str,
+                                  pole: str = "N",
+                                  streaming: bool = True,
+                                  crop_halo: int = 16,
+                                  workers: Optional[int] = None,
+                                  threads_per_worker: Optional[int] = None,
+                                  compact_accumulators: Optional[bool] = None) -> Dict:
+        """
+        Process multiple files for 8x enhanced polar image
+
+        Args:
+            h5_files: List of HDF5 file paths
+            orbit_type: 'A' or 'D'
+            pole: 'N' or 'S'
+            streaming: Grid each enhanced swath as soon as it is produced, so
+                peak memory does not grow with the number of granules. If
+                False, all swaths are enhanced before gridding.
+            crop_halo: Native scan lines of SR context kept beyond the
+                scan lines that reach the pole's grid
+            workers: CPU worker processes enhancing granules at once, each
+                with its own model replica; the configured number if None,
+                and this process alone if 1 or on a GPU
+            threads_per_worker: Torch intra-op threads per worker, the
+                configured number if None
+            compact_accumulators: Grid into the compact accumulator layout,
+                the configured setting if None
+
+        Returns:
+            Dictionary with enhanced polar data
+        """
+        logger.info(f"Processing {len(h5_files)} files for 8x enhanced polar image")
+
+        workers = workers or self.inference_opt['workers']
+        threads_per_worker = threads_per_worker or self.inference_opt['threads_per_worker']
+        if workers > 1 and self.device.type != 'cpu':
+            logger.info(f"Worker processes are CPU only, enhancing on {self.device} in this process")
+            workers = 1
+
+        if workers > 1 and len(h5_files) > 1:
+            enhanced_swaths = self._iter_enhanced_swaths_parallel(
+                h5_files, orbit_type, pole, crop_halo, workers, threads_per_worker
+            )
+        else:
+            enhanced_swaths = self._iter_enhanced_swaths(h5_files, orbit_type, pole, crop_halo)
+        if not streaming:
+            enhanced_swaths = list(enhanced_swaths)
+
         # Create enhanced polar image with 8x larger grid
         logger.info("Creating 8x enhanced polar projection")
 
         # Create custom image processor for 8x grid
-        enhanced_processor = EnhancedPolarProcessor(scale_factor=8)
+        if compact_accumulators is None:
+            compact_accumulators = self.inference_opt['compact_accumulators']
+        enhanced_processor = EnhancedPolarProcessor(scale_factor=8, compact_accumulators=compact_accumulators)
 
         # Combine all enhanced swaths into polar projection
         polar_temperature_8x = enhanced_processor.create_enhanced_polar_image(
@@ -489,7 +1288,7 @@ class TemperatureSRProcessor:
             'metadata': {
                 'orbit_type': orbit_type,
                 'pole': pole,
-                'num_swaths': len(enhanced_swaths),
+                'num_swaths': enhanced_processor.swath_count,
                 'enhancement': '8x',
                 'grid_size': polar_temperature_8x.shape
             }
@@ -499,9 +1298,16 @@ class TemperatureSRProcessor:
 class EnhancedPolarProcessor:
     """Processor for creating 8x enhanced polar projections"""
 
-    def __init__(self, scale_factor: int = 8):
+    def __init__(self, scale_factor: int = 8, workers: Optional[int] = None,
+                 compact_accumulators: bool = False):
         self.scale_factor = scale_factor
 
+        # Threads used for tiled hole filling, one per CPU if None
+        self.workers = workers
+
+        # float32 compensated sums and uint16 counts instead of float64/int32 tiles
+        self.compact_accumulators = compact_accumulators
+
         # Original EASE-Grid 2.0 parameters
         self.PIXEL_SIZE_M = 10000.0  # 10 km
         self.GRID_WIDTH = 1800
@@ -520,121 +1326,145 @@ class EnhancedPolarProcessor:
         self.GRID_ORIGIN_COL = -0.5
         self.GRID_ORIGIN_ROW = -0.5
 
-        # Set up projections
-        import pyproj
-        self.ease2_north = pyproj.CRS.from_epsg(6931)
-        self.ease2_south = pyproj.CRS.from_epsg(6932)
-        self.wgs84 = pyproj.CRS.from_epsg(4326)
+        # Projection method: 'analytic' NumPy fast path or 'pyproj'
+        self.projection_method = "analytic"
 
-        # Transformer will be set based on pole
+        # Pole and shared transformer will be set based on pole
+        self.pole = "N"
         self.transformer = None
 
-    def create_enhanced_polar_image(self, enhanced_swaths: List[Dict],
+        # Swaths gridded by the last create_enhanced_polar_image call
+        self.swath_count = 0
+
+    def create_enhanced_polar_image(self, enhanced_swaths: Iterable[Dict],
                                     orbit_type: str, pole: str = "N") -> np.ndarray:
-        """Create 8x enhanced polar image from enhanced swaths"""
+        """
+        Create 8x enhanced polar image from enhanced swaths
 
-        # Set up transformer based on pole
-        if pole == "N":
-            self.transformer = pyproj.Transformer.from_crs(
-                self.wgs84, self.ease2_north, always_xy=True
-            )
-        else:  # pole == "S"
-            self.transformer = pyproj.Transformer.from_crs(
-                self.wgs84, self.ease2_south, always_xy=True
-            )
+        Swaths are consumed one at a time and not kept, so a generator
+        streams them into the accumulator.
+        """
 
-        # Create enhanced grids
-        grid = np.zeros((self.ENHANCED_GRID_HEIGHT, self.ENHANCED_GRID_WIDTH), dtype=np.float64)
-        weight = np.zeros((self.ENHANCED_GRID_HEIGHT, self.ENHANCED_GRID_WIDTH), dtype=np.float64)
-        count = np.zeros((self.ENHANCED_GRID_HEIGHT, self.ENHANCED_GRID_WIDTH), dtype=np.int32)
+        # Set up projection based on pole (transformers are cached process-wide)
+        self.pole = pole
+        self.transformer = get_ease2_transformer(pole)
+
+        # Create enhanced grid; tiles are only allocated where swaths land
+        accumulator = TiledGridAccumulator(
+            self.ENHANCED_GRID_HEIGHT, self.ENHANCED_GRID_WIDTH, compact=self.compact_accumulators
+        )
 
         # Process each enhanced swath
+        self.swath_count = 0
         for swath_idx, swath in enumerate(enhanced_swaths):
             self._add_enhanced_swath_to_grid(
-                swath, grid, weight, count, swath_idx, pole
+                swath, accumulator, swath_idx, pole
             )
+            self.swath_count += 1
+
+            # Release the swath before the next one is produced
+            del swath
+
+        logger.info(f"Accumulated into {len(accumulator.tiles)} tiles "
+                    f"({accumulator.allocated_bytes() / 1024 ** 3:.2f} GB)")
 
         # Finalize grid
-        final_grid = self._finalize_grid(grid, weight)
+        final_grid = self._finalize_grid(accumulator)
 
         # Apply hole filling
         final_grid = self._fill_holes_enhanced(final_grid)
 
         return final_grid
 
-    def _add_enhanced_swath_to_grid(self, swath: Dict, grid: np.ndarray,
-                                    weight: np.ndarray, count: np.ndarray,
-                                    swath_idx: int, pole: str = "N"):
-        """Add enhanced swath data to grid"""
+    def _add_enhanced_swath_to_grid(self, swath: Dict, accumulator: TiledGridAccumulator,
+                                    swath_idx: int, pole: str = "N", tile_rows: int = 256):
+        """
+        Add enhanced swath data to grid
+
+        The swath carries its native-resolution geolocation. It is projected
+        once, and the EASE-Grid x/y are bilinearly resized to the pixel
+        centres of the enhanced temperature block by block, so 8x lat/lon
+        are never formed and longitude is never interpolated across the
+        dateline.
+
+        Args:
+            swath: Dictionary with the enhanced 'temperature' and native 'lat' / 'lon'
+            accumulator: 8x grid accumulator
+            swath_idx: Index of the swath in the run
+            pole: 'N' or 'S'
+            tile_rows: Native scan lines interpolated at once
+        """
         temp = swath['temperature']
         lat = swath['lat']
         lon = swath['lon']
 
-        # Filter for correct hemisphere
+        scale = self.scale_factor
+        h, w = lat.shape
+        if temp.shape != (h * scale, w * scale):
+            raise ValueError(f"Swath {swath_idx}: temperature {temp.shape} is not "
+                             f"{scale}x the geolocation {lat.shape}")
+
+        # Drop scan lines that cannot reach this pole's grid before projecting,
+        # keeping one line of interpolation support on each side
+        scan_range = hemisphere_scan_range(lat, pole, halo=1)
+        if scan_range is None:
+            return
+
+        row_start, row_stop = scan_range
+
+        # Project the native samples once; the wrong hemisphere becomes NaN
+        # and so does every enhanced pixel interpolated from it
+        lat = lat[row_start:row_stop]
+        x_ease2, y_ease2 = self._latlon_to_ease2(lat, lon[row_start:row_stop])
+
         if pole == "N":
             hemisphere_mask = lat >= 0
         else:  # pole == "S"
             hemisphere_mask = lat <= 0
 
-        if not np.any(hemisphere_mask):
-            return
-
-        # Transform to EASE-Grid 2.0
-        x_ease2, y_ease2 = self._latlon_to_ease2(lat, lon)
+        x_ease2 = np.where(hemisphere_mask, x_ease2, np.nan)
+        y_ease2 = np.where(hemisphere_mask, y_ease2, np.nan)
 
         # Get grid bounds
         x_min, x_max, y_min, y_max = self._get_grid_bounds()
 
-        # Valid data mask
-        valid_mask = (
-                hemisphere_mask &
-                ~np.isnan(temp) &
-                (x_ease2 >= x_min) & (x_ease2 <= x_max) &
-                (y_ease2 >= y_min) & (y_ease2 <= y_max)
-        )
+        for r0 in range(0, row_stop - row_start, tile_rows):
+            r1 = min(row_stop - row_start, r0 + tile_rows)
 
-        if not np.any(valid_mask):
-            return
+            # One native line of halo makes the block resize match a whole-swath resize
+            a0, a1 = max(0, r0 - 1), min(row_stop - row_start, r1 + 1)
+            size = (w * scale, (a1 - a0) * scale)
+            core = slice((r0 - a0) * scale, (r1 - a0) * scale)
 
-        # Extract valid values
-        if len(temp.shape) == 2:
-            x_vals = x_ease2[valid_mask]
-            y_vals = y_ease2[valid_mask]
-            temp_vals = temp[valid_mask]
-        else:
-            # Handle 1D arrays
-            x_vals = x_ease2[valid_mask]
-            y_vals = y_ease2[valid_mask]
-            temp_vals = temp[valid_mask]
-
-        # Convert to pixel indices (enhanced resolution)
-        px_x, px_y = self._meters_to_pixels_enhanced(x_vals, y_vals)
-
-        # Check bounds
-        valid_pixels = (
-                (px_x >= 0) & (px_x < self.ENHANCED_GRID_WIDTH) &
-                (px_y >= 0) & (px_y < self.ENHANCED_GRID_HEIGHT)
-        )
+            x_vals = cv2.resize(x_ease2[a0:a1], size, interpolation=cv2.INTER_LINEAR)[core]
+            y_vals = cv2.resize(y_ease2[a0:a1], size, interpolation=cv2.INTER_LINEAR)[core]
+            temp_vals = temp[(row_start + r0) * scale:(row_start + r1) * scale]
+
+            # Valid data mask
+            valid_mask = (
+                    ~np.isnan(temp_vals) &
+                    (x_vals >= x_min) & (x_vals <= x_max) &
+                    (y_vals >= y_min) & (y_vals <= y_max)
+            )
+
+            if not np.any(valid_mask):
+                continue
 
-        px_x = px_x[valid_pixels]
-        px_y = px_y[valid_pixels]
-        temp_vals = temp_vals[valid_pixels]
+            # Convert to pixel indices (enhanced resolution)
+            px_x, px_y = self._meters_to_pixels_enhanced(x_vals[valid_mask], y_vals[valid_mask])
 
-        # Accumulate data
-        for i in range(len(temp_vals)):
-            x_idx, y_idx = px_x[i], px_y[i]
-            value = temp_vals[i]
+            # Check bounds
+            valid_pixels = (
+                    (px_x >= 0) & (px_x < self.ENHANCED_GRID_WIDTH) &
+                    (px_y >= 0) & (px_y < self.ENHANCED_GRID_HEIGHT)
+            )
 
-            grid[y_idx, x_idx] += value
-            weight[y_idx, x_idx] += 1.0
-            count[y_idx, x_idx] += 1
+            # Accumulate data
+            accumulator.add(px_x[valid_pixels], px_y[valid_pixels], temp_vals[valid_mask][valid_pixels])
 
     def _latlon_to_ease2(self, lat, lon):
-        """Transform coordinates to EASE-Grid 2.0 (North or South based on current transformer)"""
-        x, y = self.transformer.transform(lon, lat)
-        x = np.where(np.isinf(x), np.nan, x)
-        y = np.where(np.isinf(y), np.nan, y)
-        return x, y
+        """Transform coordinates to EASE-Grid 2.0 (North or South based on current pole)"""
+        return latlon_to_ease2(lat, lon, self.pole, method=self.projection_method)
 
     def _meters_to_pixels_enhanced(self, x_m, y_m):
         """Convert EASE-Grid 2.0 coordinates to enhanced pixel indices"""
@@ -652,81 +1482,64 @@ class EnhancedPolarProcessor:
         y_max = self.MAP_ORIGIN_Y
         return x_min, x_max, y_min, y_max
 
-    def _finalize_grid(self, grid, weight):
-        """Finalize grid by averaging accumulated values"""
-        final_grid = np.full(grid.shape, np.nan, dtype=np.float32)
-        valid_mask = weight > 0
-
-        if np.any(valid_mask):
-            final_grid[valid_mask] = (grid[valid_mask] / weight[valid_mask]).astype(np.float32)
-
-        return final_grid
+    def _finalize_grid(self, accumulator: TiledGridAccumulator):
+        """Finalize grid by averaging accumulated values, one tile at a time"""
+        final_grid = temporary_memmap((self.ENHANCED_GRID_HEIGHT, self.ENHANCED_GRID_WIDTH))
+        return accumulator.finalize(out=final_grid)
 
     def _fill_holes_enhanced(self, data):
-        """Fill holes in enhanced resolution data"""
-        filled_data = data.copy()
-        rows, cols = data.shape
-
-        empty_mask = np.isnan(data)
-        if not np.any(empty_mask):
-            return filled_data
-
+        """Fill holes in enhanced resolution data, tile by tile over a memory-mapped grid"""
         # Scale parameters for enhanced resolution
         MIN_RADIUS = 2 * self.scale_factor
         MAX_RADIUS = 6 * self.scale_factor
         DISTANCE_SCALE = 400 * self.scale_factor
 
-        # Calculate distance from center
-        center_y, center_x = rows // 2, cols // 2
-        y_indices, x_indices = np.meshgrid(range(rows), range(cols), indexing='ij')
-        distance_from_center = np.sqrt((x_indices - center_x) ** 2 + (y_indices - center_y) ** 2)
-
-        filled_count = 0
-
-        # Process in batches for memory efficiency
-        batch_size = 100
-        empty_indices = np.where(empty_mask)
-        num_empty = len(empty_indices[0])
-
-        for batch_start in range(0, num_empty, batch_size):
-            batch_end = min(batch_start + batch_size, num_empty)
-
-            for idx in range(batch_start, batch_end):
-                y = empty_indices[0][idx]
-                x = empty_indices[1][idx]
-
-                dist_from_center = distance_from_center[y, x]
-
-                # Adaptive radius
-                radius_factor = min(dist_from_center / DISTANCE_SCALE, 1.0)
-                search_radius = int(MIN_RADIUS + radius_factor * (MAX_RADIUS - MIN_RADIUS))
-
-                # Define neighborhood
-                y_min = max(0, y - search_radius)
-                y_max = min(rows, y + search_radius + 1)
-                x_min = max(0, x - search_radius)
-                x_max = min(cols, x + search_radius + 1)
-
-                neighborhood = data[y_min:y_max, x_min:x_max]
-                valid_mask = ~np.isnan(neighborhood)
-                valid_count = np.sum(valid_mask)
-
-                if valid_count >= 3:
-                    # Get valid coordinates
-                    valid_y, valid_x = np.where(valid_mask)
-                    valid_y += y_min
-                    valid_x += x_min
-
-                    # Calculate weights based on distance
-                    distances = np.sqrt((valid_y - y) ** 2 + (valid_x - x) ** 2)
-                    weights = 1.0 / ((distances + 0.1) ** 2)
-                    weights /= weights.sum()
-
-                    # Weighted average
-                    valid_values = data[valid_y, valid_x]
-                    filled_value = np.sum(valid_values * weights)
-                    filled_data[y, x] = filled_value
-                    filled_count += 1
+        filled_data, filled_count = fill_holes_tiled(
+            data, MIN_RADIUS, MAX_RADIUS, DISTANCE_SCALE, power=2,
+            min_neighbors=3, workers=self.workers
+        )
 
         logger.info(f"Filled {filled_count} holes in enhanced data")
-        return filled_data
\ No newline at end of file
+        return filled_data
+
+
+# SR processor of a worker process, created once by _init_sr_worker
+_worker_sr_processor = None
+
+
+def _init_sr_worker(model_path: Path, threads: int, inference_opt: Dict):
+    """Load the model replica a SR worker process reuses for every granule"""
+    global _worker_sr_processor
+    torch.set_num_threads(threads)
+    _worker_sr_processor = TemperatureSRProcessor(model_path, device='cpu', inference_opt=inference_opt)
+
+
+def _enhance_shared_granule(input_name: str, shape: Tuple[int, int], dtype: str, output_name: str,
+                            granule_id: str, channel: str, rows: Tuple[int, int],
+                            total_rows: Optional[int] = None) -> Dict:
+    """SR worker task: one granule from a shared input segment to a shared 8x output segment"""
+    from multiprocessing import shared_memory
+
+    shm_in = shared_memory.SharedMemory(name=input_name)
+    shm_out = shared_memory.SharedMemory(name=output_name)
+    try:
+        temperature = np.ndarray(shape, np.dtype(dtype), buffer=shm_in.buf)
+        out = np.ndarray((shape[0] * 8, shape[1] * 8), np.float32, buffer=shm_out.buf)
+
+        processor = _worker_sr_processor
+        processor._apply_pending_precision(temperature)
+        processor.reset_flat_gate_stats()
+        processor._cascade_8x_cached(temperature, granule_id, channel, rows, out=out, with_bicubic=False,
+                                     total_rows=total_rows)
+        del temperature, out
+        report, error = processor.flat_gate_report(), None
+    except Exception as e:
+        # Raised without the traceback, whose frames hold views of the segments
+        report, error = None, RuntimeError(f"{type(e).__name__}: {e}")
+        temperature = out = None
+
+    shm_in.close()
+    shm_out.close()
+    if error is not None:
+        raise error
+    return report
@@ -2,10 +2,15 @@
 Temperature SR Model adapted for inference only
 """
 
+import copy
+
 import torch
 import torch.nn as nn
 from .network_swinir import SwinIR
 
+# Inference precisions, 'float32' is the reference every other mode is checked against
+PRECISION_MODES = ('float32', 'bfloat16', 'int8')
+
 
 class TemperatureSRModel:
     """Temperature SR Model for inference"""
@@ -23,6 +28,9 @@ class TemperatureSRModel:
         self.net_g = self.build_swinir_generator(opt)
         self.net_g = self.net_g.to(self.device)
 
+        self.precision = 'float32'
+        self._net_int8 = None
+
     def build_swinir_generator(self, opt):
         """Build SwinIR generator for temperature data"""
         opt_net = opt['network_g']
@@ -41,4 +49,37 @@ class TemperatureSRModel:
             resi_connection=opt_net.get('resi_connection', '3conv')
         )
 
-        return model
\ No newline at end of file
+        return model
+
+    def set_precision(self, mode: str):
+        """
+        Select the precision of infer()
+
+        'bfloat16' runs the generator under autocast, 'int8' runs a copy of
+        it with dynamically quantized nn.Linear layers (CPU only). The int8
+        copy is quantized from the weights loaded at the first request.
+
+        Args:
+            mode: One of PRECISION_MODES
+        """
+        if mode not in PRECISION_MODES:
+            raise ValueError(f"Unknown precision '{mode}', expected one of {PRECISION_MODES}")
+
+        if mode == 'int8':
+            if self.device.type != 'cpu':
+                raise ValueError("int8 dynamic quantization is only supported on CPU")
+            if self._net_int8 is None:
+                self._net_int8 = torch.ao.quantization.quantize_dynamic(
+                    copy.deepcopy(self.net_g), {nn.Linear}, dtype=torch.qint8
+                ).eval()
+
+        self.precision = mode
+
+    def infer(self, x: torch.Tensor) -> torch.Tensor:
+        """Generator forward pass in the selected precision, float32 output"""
+        if self.precision == 'bfloat16':
+            with torch.autocast(device_type=self.device.type, dtype=torch.bfloat16):
+                return self.net_g(x).float()
+        if self.precision == 'int8':
+            return self._net_int8(x)
+        return self.net_g(x)
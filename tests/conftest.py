@@ -0,0 +1,76 @@
+"""
+Shared fixtures
+The SR tests run TemperatureSRProcessor with a bilinear stand-in for SwinIR
+"""
+
+import pathlib
+import sys
+import types
+
+import pytest
+import torch
+import torch.nn.functional as F
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+
+from ml_models.config import load_config  # noqa: E402
+from ml_models.sr_processor import TemperatureSRProcessor  # noqa: E402
+
+
+class WindowCheckingUpsampler(torch.nn.Module):
+    """Bilinear 2x upsampler that, like SwinIR, rejects sides that are not window multiples"""
+
+    def __init__(self, window_size: int = 8):
+        super().__init__()
+        self.window_size = window_size
+        self.shapes = []
+
+    def forward(self, x):
+        self.shapes.append(tuple(x.shape))
+        assert x.shape[-2] % self.window_size == 0 and x.shape[-1] % self.window_size == 0, \
+            f"input {tuple(x.shape)} is not a multiple of the window size"
+        return F.interpolate(x, scale_factor=2, mode='bilinear', align_corners=False)
+
+
+@pytest.fixture
+def sr_processor():
+    """TemperatureSRProcessor on the CPU with the stand-in network and no result cache"""
+    net = WindowCheckingUpsampler()
+    processor = TemperatureSRProcessor.__new__(TemperatureSRProcessor)
+    processor.device = torch.device('cpu')
+    processor.inference_opt = load_config()['inference']
+    processor.backend = None
+    processor._pending_precision = None
+    processor.model = types.SimpleNamespace(net_g=net, precision='float32', infer=net)
+    processor.model_path = None
+    processor.result_cache = None
+    processor.reset_flat_gate_stats()
+    return processor
+
+
+@pytest.fixture
+def make_granule(tmp_path):
+    """Writer of synthetic AMSR2 L1B granules, see write_granule"""
+    def make(name: str, lat_start: float, lat_stop: float, rows: int = 120) -> pathlib.Path:
+        return write_granule(tmp_path / f"{name}.h5", lat_start, lat_stop, rows)
+    return make
+
+
+def write_granule(path: pathlib.Path, lat_start: float, lat_stop: float,
+                  rows: int = 120, seed: int = 0) -> pathlib.Path:
+    """Synthetic AMSR2 L1B granule: 36.5 GHz H temperatures on a swath from lat_start to lat_stop"""
+    import h5py
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    lat = np.repeat(np.linspace(lat_start, lat_stop, rows)[:, None], 486, axis=1)
+    lon = np.repeat(np.linspace(-40, 40, 486)[None, :], rows, axis=0)
+    raw = rng.uniform(15000, 28000, (rows, 243)).astype(np.uint16)
+
+    with h5py.File(path, "w") as h5:
+        temperature = h5.create_dataset("Brightness Temperature (36.5GHz,H)", data=raw)
+        temperature.attrs["SCALE FACTOR"] = np.array([0.01], dtype=np.float32)
+        h5.create_dataset("Latitude of Observation Point for 89A", data=lat.astype(np.float32))
+        h5.create_dataset("Longitude of Observation Point for 89A", data=lon.astype(np.float32))
+
+    return path
@@ -0,0 +1,132 @@
+"""
+Grid accumulators against a per-sample loop and the dense layout
+"""
+
+import numpy as np
+import pytest
+
+from core.grid_accumulator import (
+    CompactGridAccumulator, DenseGridAccumulator, TiledGridAccumulator,
+    accumulate_flat, accumulate_swath, partial_accumulate
+)
+
+
+def reference_accumulate(grid, weight, count, flat_idx, values):
+    """The per-sample loop the bulk accumulators replace"""
+    for pixel, value in zip(flat_idx, values):
+        grid.flat[pixel] += value
+        weight.flat[pixel] += 1.0
+        count.flat[pixel] += 1
+
+
+def prefilled_grids(rng, shape=(40, 50)):
+    """Sum, weight and count grids holding earlier samples"""
+    count = rng.integers(0, 4, shape).astype(np.int32)
+    grid = np.where(count > 0, rng.uniform(150.0, 300.0, shape) * count, 0.0)
+    return grid, count.astype(np.float64), count
+
+
+def swath_samples(rng, shape=(40, 50), n_samples=20000):
+    """Samples concentrated on few pixels, so most pixels get many of them"""
+    px_y = rng.integers(5, 15, n_samples)
+    px_x = rng.integers(10, 30, n_samples)
+    values = rng.uniform(150.0, 300.0, n_samples) + rng.normal(0.0, 1e-9, n_samples)
+    return px_x, px_y, values
+
+
+@pytest.mark.parametrize("prefilled", [False, True])
+def test_accumulate_flat_matches_loop(prefilled):
+    rng = np.random.default_rng(1)
+    shape = (40, 50)
+    if prefilled:
+        grid, weight, count = prefilled_grids(rng, shape)
+    else:
+        grid, weight, count = np.zeros(shape), np.zeros(shape), np.zeros(shape, dtype=np.int32)
+    ref = [grid.copy(), weight.copy(), count.copy()]
+
+    px_x, px_y, values = swath_samples(rng, shape)
+    flat_idx = np.ravel_multi_index((px_y, px_x), shape)
+
+    accumulate_flat(grid, weight, count, flat_idx, values)
+    reference_accumulate(*ref, flat_idx, values)
+
+    assert np.array_equal(grid, ref[0])
+    assert np.array_equal(weight, ref[1])
+    assert np.array_equal(count, ref[2])
+
+
+def test_accumulate_swath_matches_loop_over_several_swaths():
+    rng = np.random.default_rng(2)
+    shape = (40, 50)
+    grid, weight, count = prefilled_grids(rng, shape)
+    ref = [grid.copy(), weight.copy(), count.copy()]
+
+    for _ in range(3):
+        px_x, px_y, values = swath_samples(rng, shape, n_samples=5000)
+        accumulate_swath(grid, weight, count, px_x, px_y, values)
+        reference_accumulate(*ref, np.ravel_multi_index((px_y, px_x), shape), values)
+
+    assert np.array_equal(grid, ref[0])
+    assert np.array_equal(weight, ref[1])
+    assert np.array_equal(count, ref[2])
+
+
+def test_accumulate_empty_swath_is_a_no_op():
+    grid, weight, count = np.ones((4, 4)), np.ones((4, 4)), np.ones((4, 4), dtype=np.int32)
+    accumulate_swath(grid, weight, count, np.array([], dtype=int), np.array([], dtype=int), np.array([]))
+    assert np.array_equal(grid, np.ones((4, 4)))
+    assert np.array_equal(count, np.ones((4, 4)))
+
+
+def test_compact_mean_matches_dense_to_float32_rounding():
+    rng = np.random.default_rng(3)
+    shape = (40, 50)
+    dense = DenseGridAccumulator(*shape)
+    compact = CompactGridAccumulator(*shape)
+    naive_total = np.zeros(shape, dtype=np.float32)
+
+    # Many granules piling up on the same pixels, as near the pole
+    for _ in range(200):
+        px_x, px_y, values = swath_samples(rng, shape, n_samples=2000)
+        partial = partial_accumulate(np.ravel_multi_index((px_y, px_x), shape), values)
+        dense.merge(*partial)
+        compact.merge(*partial)
+        naive_total.flat[partial[0]] += partial[1].astype(np.float32)
+
+    valid = dense.count > 0
+    assert np.array_equal(compact.count, dense.count)
+    assert np.array_equal(np.isnan(compact.mean()), ~valid)
+
+    # The compensated sum keeps far more than float32 precision
+    exact_sum = dense.grid[valid]
+    compensated_sum = compact.total[valid].astype(np.float64) + compact.compensation[valid]
+    naive_error = np.abs(naive_total[valid] - exact_sum).max()
+    assert np.abs(compensated_sum - exact_sum).max() < naive_error / 1000
+
+    # Means differ by at most one float32 rounding
+    np.testing.assert_array_max_ulp(compact.mean()[valid], dense.mean()[valid], maxulp=1)
+
+
+def test_compact_count_overflow_widens_instead_of_aborting():
+    limit = np.iinfo(np.uint16).max
+    compact = CompactGridAccumulator(2, 2)
+    pixels = np.array([0, 3])
+
+    compact.merge(pixels, np.array([250.0 * limit, 260.0]), np.array([limit, 1], dtype=np.int32))
+    compact.merge(pixels, np.array([250.0 * 10, 270.0]), np.array([10, 1], dtype=np.int32))
+
+    assert compact.count.dtype == np.uint32
+    assert compact.count.flat[0] == limit + 10
+    np.testing.assert_allclose(compact.mean().flat[[0, 3]], [250.0, 265.0])
+
+
+def test_tiled_compact_count_overflow_widens_the_tile():
+    limit = np.iinfo(np.uint16).max
+    tiled = TiledGridAccumulator(8, 8, tile_size=4, compact=True)
+    px = np.full(limit + 5, 5)
+
+    tiled.add(px, px, np.full(limit + 5, 240.0))
+
+    final = tiled.finalize()
+    assert final[5, 5] == pytest.approx(240.0)
+    assert np.isnan(final[0, 0])
@@ -0,0 +1,87 @@
+"""
+Vectorized hole filling against the per-pixel loop it replaced
+"""
+
+import numpy as np
+import pytest
+
+from core.hole_filling import fill_holes
+
+
+def reference_fill_holes(data, search_radius, power, coverage_threshold, min_neighbors):
+    """The former per-pixel filler of ImageProcessor._smart_fill_holes"""
+    filled_data = data.copy()
+    rows, cols = data.shape
+    empty_mask = np.isnan(data)
+
+    for y in range(rows):
+        for x in range(cols):
+            if not empty_mask[y, x]:
+                continue
+
+            radius = int(search_radius[y, x])
+            y_min, y_max = max(0, y - radius), min(rows, y + radius + 1)
+            x_min, x_max = max(0, x - radius), min(cols, x + radius + 1)
+
+            neighborhood = data[y_min:y_max, x_min:x_max]
+            valid_mask = ~np.isnan(neighborhood)
+            valid_count = np.sum(valid_mask)
+            coverage = valid_count / neighborhood.size
+
+            if coverage >= coverage_threshold and valid_count >= min_neighbors:
+                valid_y, valid_x = np.where(valid_mask)
+                valid_y += y_min
+                valid_x += x_min
+
+                distances = np.sqrt((valid_y - y) ** 2 + (valid_x - x) ** 2)
+                weights = 1.0 / ((distances + 0.1) ** power)
+                weights /= weights.sum()
+                filled_data[y, x] = np.sum(data[valid_y, valid_x] * weights)
+
+    return filled_data
+
+
+def polar_like_grid(rows=90, cols=110, seed=0):
+    """float32 temperatures with scattered holes, a data-free disc and radii growing outwards"""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:rows, 0:cols]
+    data = (240.0 + 20.0 * np.sin(x / 9.0) * np.cos(y / 13.0) + rng.normal(0.0, 2.0, (rows, cols)))
+    data = data.astype(np.float32)
+
+    data[rng.random((rows, cols)) < 0.25] = np.nan
+    data[np.hypot(y - 30, x - 70) < 8] = np.nan
+
+    distance = np.hypot(y - rows // 2, x - cols // 2)
+    search_radius = (2 + np.minimum(distance / 40.0, 1.0) * 4).astype(np.int32)
+    return data, search_radius
+
+
+@pytest.mark.parametrize("coverage_threshold, min_neighbors", [(0.3, 3), (0.0, 1), (0.6, 5)])
+def test_fill_holes_matches_reference_loop(coverage_threshold, min_neighbors):
+    data, search_radius = polar_like_grid()
+
+    filled, filled_count = fill_holes(data, search_radius, power=4,
+                                      coverage_threshold=coverage_threshold,
+                                      min_neighbors=min_neighbors)
+    expected = reference_fill_holes(data, search_radius, 4, coverage_threshold, min_neighbors)
+
+    # The same pixels are filled, with the same values to float32 rounding
+    assert np.array_equal(np.isnan(filled), np.isnan(expected))
+    assert 0 < filled_count == np.sum(np.isnan(data) & ~np.isnan(expected))
+    valid = ~np.isnan(expected)
+    assert np.abs(filled[valid] - expected[valid]).max() < 1e-4
+    # Original pixels are kept as they are
+    assert np.array_equal(filled[~np.isnan(data)], data[~np.isnan(data)])
+
+
+def test_fill_holes_only_fills_inside_the_region():
+    data, search_radius = polar_like_grid()
+    region = np.zeros(data.shape, dtype=bool)
+    region[:, :40] = True
+
+    filled, _ = fill_holes(data, search_radius, power=4, coverage_threshold=0.3,
+                           min_neighbors=3, fill_region=region)
+    expected = reference_fill_holes(data, search_radius, 4, 0.3, 3)
+
+    assert np.array_equal(np.isnan(filled[:, 40:]), np.isnan(data[:, 40:]))
+    np.testing.assert_allclose(filled[:, :40], expected[:, :40], atol=1e-4)
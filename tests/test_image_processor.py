@@ -0,0 +1,93 @@
+"""
+Polar gridding of ImageProcessor on synthetic granules
+"""
+
+import numpy as np
+import pytest
+
+from core.grid_accumulator import DenseGridAccumulator
+from core.image_processor import ImageProcessor
+
+
+def make_processor(tmp_path, **kwargs):
+    """ImageProcessor with its caches in tmp_path"""
+    kwargs.setdefault('index_cache_dir', tmp_path / "swath_index")
+    kwargs.setdefault('accumulator_dir', tmp_path / "polar_accumulators")
+    return ImageProcessor(**kwargs)
+
+
+def test_serial_gridding_matches_per_sample_loop(tmp_path, make_granule):
+    h5_files = [make_granule("first", 62.0, 88.0), make_granule("second", 70.0, 86.0)]
+    processor = make_processor(tmp_path, workers=1, use_accumulator_store=False)
+    processor.pole = "N"
+
+    accumulator = DenseGridAccumulator(processor.GRID_HEIGHT, processor.GRID_WIDTH)
+    grid = np.zeros_like(accumulator.grid)
+    weight = np.zeros_like(accumulator.weight)
+    count = np.zeros_like(accumulator.count)
+
+    # The second granule overlaps the first, so it lands on a pre-filled grid
+    for idx, h5_path in enumerate(h5_files):
+        processor._add_swath_to_grid(h5_path, accumulator, idx, "A", "N")
+
+        flat_idx, values = processor._swath_samples(h5_path, "N")
+        assert len(np.unique(flat_idx)) < len(flat_idx)
+        for pixel, value in zip(flat_idx, values):
+            grid.flat[pixel] += value
+            weight.flat[pixel] += 1.0
+            count.flat[pixel] += 1
+
+    assert np.array_equal(accumulator.grid, grid)
+    assert np.array_equal(accumulator.weight, weight)
+    assert np.array_equal(accumulator.count, count)
+
+
+def test_index_cache_is_keyed_by_projection_method(tmp_path, make_granule):
+    import h5py
+    from core.swath_index_cache import INDEX_FORMAT_VERSION
+
+    h5_path = make_granule("granule", 62.0, 88.0)
+    processor = make_processor(tmp_path, workers=1, use_accumulator_store=False)
+    cache_dir = processor.index_cache.cache_dir
+
+    mappings = {}
+    for method in ("analytic", "pyproj"):
+        processor.projection_method = method
+        with h5py.File(h5_path, "r") as h5:
+            mappings[method] = processor._get_swath_pixels(h5, h5_path.stem, "N")
+
+    names = sorted(path.name for path in cache_dir.glob("*.npz"))
+    assert names == [f"granule_N_1800x1800_10000m_{method}_v{INDEX_FORMAT_VERSION}.npz"
+                     for method in ("analytic", "pyproj")]
+
+    # Each method reads back its own entry
+    for method, (geo_mask, pixel_index) in mappings.items():
+        cached = processor.index_cache.load("granule", "N", (1800, 1800), 10000.0, method)
+        assert np.array_equal(cached[0], geo_mask)
+        assert np.array_equal(cached[1], pixel_index)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_rerun_resumes_from_stored_accumulators(tmp_path, make_granule, capsys, compact):
+    first = make_granule("first", 62.0, 88.0)
+    second = make_granule("second", 70.0, 86.0)
+    date_str = "2024-01-15"
+
+    # The earlier run of the day only had the first granule
+    earlier = make_processor(tmp_path, workers=1, compact_accumulators=compact)
+    earlier.create_polar_image([first], "A", "N", date_str=date_str)
+    assert earlier.included_granules(date_str, "A", "N") == {"first"}
+
+    rerun = make_processor(tmp_path, workers=1, compact_accumulators=compact)
+    resumed = rerun.create_polar_image([first, second], "A", "N", date_str=date_str)
+    assert "Reusing 1 accumulated granules, 1 new" in capsys.readouterr().out
+    assert rerun.included_granules(date_str, "A", "N") == {"first", "second"}
+
+    one_shot = make_processor(tmp_path, workers=1, compact_accumulators=compact,
+                              use_accumulator_store=False)
+    expected = one_shot.create_polar_image([first, second], "A", "N")
+    assert np.array_equal(resumed, expected, equal_nan=True)
+
+    # Nothing new: the stored day is finalized as it is
+    unchanged = rerun.create_polar_image([], "A", "N", date_str=date_str)
+    assert np.array_equal(unchanged, expected, equal_nan=True)
@@ -0,0 +1,67 @@
+"""
+Fused window attention against the reference path
+"""
+
+import pytest
+import torch
+
+from ml_models.network_swinir import SwinIR, WindowAttention, clear_mask_cache, set_fused_attention
+
+
+def small_swinir():
+    """Two-block SwinIR whose second block uses shifted windows"""
+    torch.manual_seed(0)
+    model = SwinIR(
+        img_size=16, in_chans=1, embed_dim=24, depths=[2], num_heads=[3],
+        window_size=8, mlp_ratio=2, upscale=2, upsampler='pixelshuffle', resi_connection='3conv'
+    )
+    return model.eval()
+
+
+def window_attention_modules(model):
+    return [module for module in model.modules() if isinstance(module, WindowAttention)]
+
+
+def cached_tensor_bytes(module):
+    """Bytes of the tensors a WindowAttention keeps besides its parameters and buffers"""
+    def nbytes(value):
+        if isinstance(value, torch.Tensor):
+            return value.nelement() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(nbytes(item) for item in value)
+        return 0
+    return sum(nbytes(value) for value in vars(module).values())
+
+
+# 16x16 is the training resolution (registered mask), 24x40 goes through the mask cache
+@pytest.mark.parametrize("height, width", [(16, 16), (24, 40)])
+def test_fused_attention_matches_reference(height, width):
+    model = small_swinir()
+    x = torch.rand(2, 1, height, width)
+
+    with torch.no_grad():
+        set_fused_attention(model, False)
+        reference = model(x)
+        set_fused_attention(model, True)
+        fused = model(x)
+        fused_again = model(x)
+
+    assert fused.shape == (2, 1, 2 * height, 2 * width)
+    torch.testing.assert_close(fused, reference, rtol=1e-5, atol=1e-5)
+    assert torch.equal(fused, fused_again)
+
+
+def test_fused_attention_caches_only_the_bias():
+    model = small_swinir()
+    clear_mask_cache()
+
+    with torch.no_grad():
+        for height, width in [(16, 16), (24, 40), (64, 64)]:
+            model(torch.rand(1, 1, height, width))
+
+    for module in window_attention_modules(model):
+        n = module.window_size[0] * module.window_size[1]
+        bias_bytes = module.num_heads * n * n * 4
+        # Independent of the number of windows in the inputs seen so far
+        assert module._bias_cache.shape == (module.num_heads, n, n)
+        assert cached_tensor_bytes(module) == bias_bytes
@@ -0,0 +1,40 @@
+"""
+Analytic EASE-Grid 2.0 projection against pyproj
+"""
+
+import numpy as np
+import pytest
+
+from core.projection import latlon_to_ease2
+
+
+def hemisphere_points(pole, n=200000, seed=0):
+    """Random points over one hemisphere, densest towards the pole"""
+    rng = np.random.default_rng(seed)
+    sign = 1.0 if pole == "N" else -1.0
+    colatitude = np.concatenate([rng.uniform(0.0, 90.0, n), 10.0 ** rng.uniform(-9.0, 0.0, n // 10)])
+    lat = sign * (90.0 - colatitude)
+    lon = rng.uniform(-180.0, 180.0, lat.size)
+    return lat, lon, colatitude
+
+
+@pytest.mark.parametrize("pole", ["N", "S"])
+def test_analytic_projection_matches_pyproj(pole):
+    lat, lon, colatitude = hemisphere_points(pole)
+
+    x, y = latlon_to_ease2(lat, lon, pole, method="analytic")
+    x_ref, y_ref = latlon_to_ease2(lat, lon, pole, method="pyproj")
+    error = np.hypot(x - x_ref, y - y_ref)
+
+    assert np.isfinite(error).all()
+    # PROJ snaps points within about a metre (1e-5 degrees) of the pole onto it
+    assert error.max() < 0.5
+    # Both lose precision in q_p - q close to the pole
+    assert error[colatitude > 1e-5].max() < 5e-2
+    assert error[colatitude > 0.1].max() < 1e-5
+
+
+@pytest.mark.parametrize("pole", ["N", "S"])
+def test_analytic_projection_rejects_invalid_latitudes(pole):
+    x, y = latlon_to_ease2(np.array([91.0, -95.0, np.nan]), np.zeros(3), pole, method="analytic")
+    assert np.isnan(x).all() and np.isnan(y).all()
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("rows", [2040, 2036, 1979, 37])
+def test_cascade_handles_rows_off_the_window_grid(sr_processor, rows):
+    rng = np.random.default_rng(rows)
+    temperature = rng.uniform(200, 260, (rows, 27)).astype(np.float32)
+
+    sr_8x, _, stage_stats = sr_processor._cascade_8x_streamed(temperature, with_bicubic=False)
+
+    assert sr_8x.shape == (rows * 8, 27 * 8)
+    assert np.isfinite(sr_8x).all()
+    assert [stats['shape'] for stats in stage_stats] == [(rows * 2, 54), (rows * 4, 108), (rows * 8, 216)]
+    assert all(shape[-2] % 8 == 0 and shape[-1] % 8 == 0 for shape in sr_processor.model.net_g.shapes)
+
+
+def test_padding_does_not_change_window_aligned_output(sr_processor):
+    rng = np.random.default_rng(0)
+    image = rng.random((48, 40)).astype(np.float32)
+
+    aligned = sr_processor._sr_2x_normalized(image)
+    cropped = sr_processor._sr_2x_normalized(image[:45, :37])
+
+    assert cropped.shape == (90, 74)
+    # Away from the padded edge the result is the same as without padding
+    np.testing.assert_allclose(cropped[:60, :50], aligned[:60, :50], atol=1e-5)
+
+
+def test_polar_crop_off_the_window_grid_is_enhanced(sr_processor, make_granule):
+    # Scan lines 60-119 reach the north grid, 16 more lines of context make 76
+    granule = make_granule("crossing", -60.0, 60.0)
+
+    swaths = list(sr_processor._iter_enhanced_swaths([granule], 'A', pole='N', crop_halo=16))
+
+    assert len(swaths) == 1
+    assert swaths[0]['metadata']['row_range'] == (44, 120)
+    assert swaths[0]['temperature'].shape == (76 * 8, 243 * 8)
+    assert swaths[0]['lat'].shape == (76, 243)
+
+
+def test_failing_granule_does_not_abort_polar_run(sr_processor, make_granule):
+    bad = make_granule("bad", 10.0, 80.0)
+    good = make_granule("good", 10.0, 80.0, rows=64)
+    cascade = sr_processor._cascade_8x_cached
+
+    def failing_cascade(temperature, granule_id, *args, **kwargs):
+        if granule_id == "bad":
+            raise RuntimeError("inference failed")
+        return cascade(temperature, granule_id, *args, **kwargs)
+
+    sr_processor._cascade_8x_cached = failing_cascade
+    swaths = list(sr_processor._iter_enhanced_swaths([bad, good], 'A', pole='N'))
+
+    assert [swath['metadata']['filename'] for swath in swaths] == ["good.h5"]
+
+
+def test_strip_cache_entry_serves_polar_crop(sr_processor, make_granule, tmp_path):
+    from core.data_handler import DataHandler
+    from ml_models.sr_cache import SRResultCache
+
+    granule = make_granule("cached", -60.0, 60.0)
+    checkpoint = tmp_path / "model.pth"
+    checkpoint.write_bytes(b"checkpoint")
+    sr_processor.model_path = checkpoint
+    sr_processor.result_cache = SRResultCache(tmp_path / "sr_cache", max_bytes=1 << 30)
+
+    # An 8x strip run stores the whole granule
+    data_handler = DataHandler()
+    temperature, _ = data_handler.extract_temperature_data(granule)
+    strip_8x, _, _ = sr_processor._cascade_8x_cached(
+        temperature, granule.stem, data_handler.var_name, with_bicubic=False
+    )
+    strip_8x = np.array(strip_8x)
+
+    def no_cascade(*args, **kwargs):
+        raise AssertionError("the polar crop was enhanced again")
+
+    sr_processor._cascade_8x_streamed = no_cascade
+    swaths = list(sr_processor._iter_enhanced_swaths([granule], 'A', pole='N', crop_halo=16))
+
+    assert len(swaths) == 1
+    assert swaths[0]['metadata']['row_range'] == (44, 120)
+    np.testing.assert_array_equal(swaths[0]['temperature'], strip_8x[44 * 8:120 * 8])
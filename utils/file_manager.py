@@ -5,7 +5,7 @@ File management utilities
 import os
 import shutil
 import pathlib
-from typing import List
+from typing import List, Optional, Tuple
 import sys
 
 
@@ -18,15 +18,34 @@ class FileManager:
             # When frozen, use system temp directory
             import tempfile
             self.temp_dir = pathlib.Path(tempfile.gettempdir()) / "satelliteprocessor_temp"
+            # Persistent caches survive cleanup_temp, keep them beside the config
+            self.cache_dir = pathlib.Path.home() / ".satelliteprocessor" / "cache"
         else:
             self.project_root = pathlib.Path(__file__).parent.parent
             self.temp_dir = self.project_root / "temp"
+            self.cache_dir = self.project_root / "cache"
 
     def get_temp_dir(self) -> pathlib.Path:
         """Get temporary directory path, creating if needed"""
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         return self.temp_dir
 
+    def get_cache_dir(self, name: str) -> pathlib.Path:
+        """
+        Get a persistent cache subdirectory, creating if needed
+
+        Unlike the temp directory, caches are not removed by cleanup_temp.
+
+        Args:
+            name: Cache subdirectory name
+
+        Returns:
+            Cache directory path
+        """
+        cache_dir = self.cache_dir / name
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir
+
     def cleanup_temp(self) -> bool:
         """Clean up all files in temp directory"""
         try:
@@ -215,4 +234,51 @@ class FileManager:
 
         except Exception as e:
             print(f"Error calculating directory size: {e}")
-            return 0.0
\ No newline at end of file
+            return 0.0
+
+def evict_least_recently_used(directory: pathlib.Path, max_bytes: int, pattern: str,
+                              keep: Optional[pathlib.Path] = None,
+                              sidecar_suffixes: Tuple[str, ...] = ()) -> int:
+    """
+    Delete the least recently used cache files until a directory fits a size limit
+
+    Recency is the modification time, which cache loads refresh. Temporary
+    files of writes in progress ('*.tmp.*') are neither counted nor deleted.
+
+    Args:
+        directory: Cache directory
+        max_bytes: Total size of matching files to shrink to
+        pattern: Glob pattern of the cache entries
+        keep: Entry that is never deleted, usually the one just written
+        sidecar_suffixes: Suffixes of companion files deleted with an entry
+
+    Returns:
+        Number of entries deleted
+    """
+    entries = []
+    for path in pathlib.Path(directory).glob(pattern):
+        if ".tmp." in path.name:
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            path.unlink()
+            for suffix in sidecar_suffixes:
+                path.with_suffix(suffix).unlink(missing_ok=True)
+            total -= size
+            deleted += 1
+        except OSError as e:
+            print(f"Could not evict cache entry {path.name}: {e}")
+
+    return deleted